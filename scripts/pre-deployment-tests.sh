@@ -94,9 +94,10 @@ echo ""
 echo "🔧 2. Unit Tests"
 echo "================"
 
-# Run existing unit tests
-run_test_with_output "Entity extractor unit tests" 'python -m pytest tests/test_entity_extractor.py -v'
-run_test_with_output "Simple functionality tests" 'python -m pytest tests/test_simple.py -v'
+# Run existing unit tests, loading only the plugins the suite uses
+PYTEST_FAST="PYTEST_DISABLE_PLUGIN_AUTOLOAD=1 python -m pytest -p pytest_asyncio.plugin"
+run_test_with_output "Entity extractor unit tests" "$PYTEST_FAST tests/test_entity_extractor.py -v"
+run_test_with_output "Simple functionality tests" "$PYTEST_FAST tests/test_simple.py -v"
 
 echo ""
 echo "🔌 3. Integration Tests (Local)"
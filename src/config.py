@@ -10,9 +10,25 @@ from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings
 from functools import lru_cache
 import os
+import sys
 from pathlib import Path
 
 
+# Reference values for field validators, built once at import time
+_VALID_LOG_LEVELS = frozenset({'DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'})
+_SUPPORTED_MODELS = frozenset({
+    'gpt-4-turbo', 'gpt-4', 'gpt-3.5-turbo',
+    'gpt-4-turbo-preview', 'gpt-4-1106-preview'
+})
+_NEO4J_URI_PREFIXES = ('bolt://', 'bolt+s://', 'neo4j://', 'neo4j+s://')
+
+# Project root (the directory containing src/)
+_BASE_PATH = Path(__file__).resolve().parent.parent
+
+# Path to the configuration file
+CONFIG_FILE_PATH = _BASE_PATH / ".env"
+
+
 class Settings(BaseSettings):
     """Application settings with type validation and environment variable support."""
     
@@ -21,12 +37,37 @@ class Settings(BaseSettings):
     llm_model: str = Field(default="gpt-4-turbo", description="LLM model to use")
     llm_temperature: float = Field(default=0.1, ge=0.0, le=2.0, description="LLM temperature")
     llm_max_tokens: int = Field(default=2000, gt=0, description="Maximum tokens for LLM response")
+    openai_max_concurrency: int = Field(
+        default=50, 
+        gt=0, 
+        description="Maximum in-flight OpenAI requests per API key"
+    )
     
     # Neo4j Configuration
     neo4j_uri: str = Field(default="bolt://localhost:7687", description="Neo4j database URI")
     neo4j_user: str = Field(default="neo4j", description="Neo4j username")
     neo4j_password: str = Field(default="password", description="Neo4j password")
     neo4j_database: str = Field(default="neo4j", description="Neo4j database name")
+    neo4j_max_connection_pool_size: int = Field(
+        default=50, 
+        gt=0, 
+        description="Maximum connections held in the Neo4j driver pool"
+    )
+    neo4j_connection_acquisition_timeout: float = Field(
+        default=60.0, 
+        gt=0, 
+        description="Seconds to wait for a pooled Neo4j connection"
+    )
+    neo4j_max_connection_lifetime: int = Field(
+        default=3600, 
+        gt=0, 
+        description="Seconds before a pooled Neo4j connection is recycled"
+    )
+    neo4j_connection_timeout: float = Field(
+        default=30.0, 
+        gt=0, 
+        description="Seconds to wait when opening a new Neo4j connection"
+    )
     
     # Processing Configuration
     max_entities_per_newsletter: int = Field(
@@ -34,6 +75,11 @@ class Settings(BaseSettings):
         gt=0, 
         description="Maximum entities to extract per newsletter"
     )
+    max_extraction_chars: int = Field(
+        default=3000, 
+        gt=0, 
+        description="Characters of cleaned newsletter text sent to the LLM"
+    )
     fact_extraction_batch_size: int = Field(
         default=10, 
         gt=0, 
@@ -120,19 +166,15 @@ class Settings(BaseSettings):
     @field_validator('log_level')
     def validate_log_level(cls, v):
         """Validate log level is supported."""
-        valid_levels = ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
-        if v.upper() not in valid_levels:
-            raise ValueError(f'Log level must be one of: {valid_levels}')
-        return v.upper()
+        level = v.upper()
+        if level not in _VALID_LOG_LEVELS:
+            raise ValueError(f'Log level must be one of: {sorted(_VALID_LOG_LEVELS)}')
+        return level
     
     @field_validator('llm_model')
     def validate_llm_model(cls, v):
         """Validate LLM model is supported."""
-        supported_models = [
-            'gpt-4-turbo', 'gpt-4', 'gpt-3.5-turbo', 
-            'gpt-4-turbo-preview', 'gpt-4-1106-preview'
-        ]
-        if v not in supported_models:
+        if v not in _SUPPORTED_MODELS:
             # Just warn, don't fail - allows for new models
             pass
         return v
@@ -140,48 +182,53 @@ class Settings(BaseSettings):
     @field_validator('neo4j_uri')
     def validate_neo4j_uri(cls, v):
         """Basic validation of Neo4j URI format."""
-        valid_prefixes = ['bolt://', 'bolt+s://', 'neo4j://', 'neo4j+s://']
-        if not any(v.startswith(prefix) for prefix in valid_prefixes):
-            raise ValueError(f'Neo4j URI must start with one of: {", ".join(valid_prefixes)}')
+        if not v.startswith(_NEO4J_URI_PREFIXES):
+            raise ValueError(f'Neo4j URI must start with one of: {", ".join(_NEO4J_URI_PREFIXES)}')
         return v
     
     model_config = {
         "env_file_encoding": "utf-8",
         "case_sensitive": False,
-        "extra": "allow"  # Allow extra fields for forward compatibility
+        "extra": "allow",  # Allow extra fields for forward compatibility
+        # Build validators on first instantiation rather than at import, so only
+        # the settings class selected by get_settings() pays that cost
+        "defer_build": True,
     }
 
 
-def get_env_file() -> str:
+def get_env_file(environment: Optional[str] = None) -> str:
     """Dynamically determine which .env file to load based on ENVIRONMENT variable."""
-    environment = os.getenv("ENVIRONMENT", "local").lower()
-    base_path = Path(__file__).parent.parent
-    
+    environment = (environment or os.getenv("ENVIRONMENT", "local")).lower()
+    return _resolve_env_file(environment)
+
+
+@lru_cache(maxsize=8)
+def _resolve_env_file(environment: str) -> str:
+    """Find the .env file for an environment (filesystem is probed once per environment)."""
     # Priority order for environment files
-    env_files = []
-    
     if environment == "test":
         # For test environment, look in tests folder first
         env_files = [
-            base_path / "tests" / ".env.test",  # tests/.env.test
-            base_path / f".env.{environment}",  # fallback to root .env.test
-            base_path / ".env.example",         # fallback to example template
+            _BASE_PATH / "tests" / ".env.test",  # tests/.env.test
+            _BASE_PATH / f".env.{environment}",  # fallback to root .env.test
+            _BASE_PATH / ".env.example",         # fallback to example template
         ]
     else:
         # For other environments (local, production, etc.)
         env_files = [
-            base_path / f".env.{environment}",  # .env.local, .env.production, etc.
-            base_path / ".env",                 # standard .env file
-            base_path / ".env.example",         # fallback to example template
+            _BASE_PATH / f".env.{environment}",  # .env.local, .env.production, etc.
+            _BASE_PATH / ".env",                 # standard .env file
+            _BASE_PATH / ".env.example",         # fallback to example template
         ]
     
     # Return the first file that exists
     for env_file in env_files:
-        if env_file.exists():
-            return str(env_file)
+        env_file = str(env_file)
+        if os.path.isfile(env_file):
+            return env_file
     
     # Return example template if nothing else exists
-    return str(base_path / ".env.example")
+    return str(_BASE_PATH / ".env.example")
 
 
 class DevelopmentSettings(Settings):
@@ -228,10 +275,9 @@ def get_settings() -> Settings:
         return Settings(_env_file=env_file)
 
 
-@lru_cache()
 def get_config_file_path() -> Path:
     """Get the path to the configuration file."""
-    return Path(__file__).parent.parent / ".env"
+    return CONFIG_FILE_PATH
 
 
 def validate_configuration(settings: Settings) -> List[str]:
@@ -274,28 +320,30 @@ def validate_configuration(settings: Settings) -> List[str]:
 
 def print_configuration_summary(settings: Settings) -> None:
     """Print a summary of the current configuration."""
-    env_file = get_env_file()
-    env_file_name = Path(env_file).name
-    
-    print("🔧 Configuration Summary:")
-    print(f"  Environment: {os.getenv('ENVIRONMENT', 'local')}")
-    print(f"  Config File: {env_file_name}")
-    print(f"  LLM Model: {settings.llm_model}")
-    print(f"  Neo4j URI: {settings.neo4j_uri}")
-    print(f"  API Host: {settings.api_host}:{settings.api_port}")
-    print(f"  Log Level: {settings.log_level}")
-    print(f"  Debug Mode: {settings.enable_debug_mode}")
-    print(f"  Metrics Enabled: {settings.enable_metrics}")
-    print(f"  Max Entities: {settings.max_entities_per_newsletter}")
-    print(f"  Entity Confidence Threshold: {settings.entity_confidence_threshold}")
-    print(f"  Fact Confidence Threshold: {settings.fact_confidence_threshold}")
+    env_file_name = Path(get_env_file()).name
+    
+    summary = (
+        "🔧 Configuration Summary:\n"
+        f"  Environment: {os.getenv('ENVIRONMENT', 'local')}\n"
+        f"  Config File: {env_file_name}\n"
+        f"  LLM Model: {settings.llm_model}\n"
+        f"  Neo4j URI: {settings.neo4j_uri}\n"
+        f"  API Host: {settings.api_host}:{settings.api_port}\n"
+        f"  Log Level: {settings.log_level}\n"
+        f"  Debug Mode: {settings.enable_debug_mode}\n"
+        f"  Metrics Enabled: {settings.enable_metrics}\n"
+        f"  Max Entities: {settings.max_entities_per_newsletter}\n"
+        f"  Entity Confidence Threshold: {settings.entity_confidence_threshold}\n"
+        f"  Fact Confidence Threshold: {settings.fact_confidence_threshold}\n"
+    )
     
     # Validation messages
     messages = validate_configuration(settings)
     if messages:
-        print("\n📋 Configuration Messages:")
-        for message in messages:
-            print(f"  {message}")
+        summary += "\n📋 Configuration Messages:\n"
+        summary += "".join(f"  {message}\n" for message in messages)
+    
+    sys.stdout.write(summary)
 
 
 # Convenience function for direct import
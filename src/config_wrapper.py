@@ -2,29 +2,51 @@
 from .config import get_settings
 
 class Config:
-    """Wrapper class for settings to maintain compatibility with notebook code."""
-    
-    def __init__(self):
-        settings = get_settings()
-        
+    """Wrapper class for settings to maintain compatibility with notebook code.
+
+    Attributes are looked up on the cached settings instance when accessed
+    instead of being copied onto every wrapper.
+    """
+
+    __slots__ = ()
+
+    # Wrapper attribute name -> Settings field name
+    _FIELDS = dict((
         # LLM Configuration
-        self.OPENAI_API_KEY = settings.openai_api_key
-        self.LLM_MODEL = settings.llm_model
-        self.LLM_TEMPERATURE = settings.llm_temperature
-        self.LLM_MAX_TOKENS = settings.llm_max_tokens
-        
+        ("OPENAI_API_KEY", "openai_api_key"),
+        ("LLM_MODEL", "llm_model"),
+        ("LLM_TEMPERATURE", "llm_temperature"),
+        ("LLM_MAX_TOKENS", "llm_max_tokens"),
+        ("OPENAI_MAX_CONCURRENCY", "openai_max_concurrency"),
+
         # Neo4j Configuration
-        self.NEO4J_URI = settings.neo4j_uri
-        self.NEO4J_USER = settings.neo4j_user
-        self.NEO4J_PASSWORD = settings.neo4j_password
-        self.NEO4J_DATABASE = settings.neo4j_database
-        
+        ("NEO4J_URI", "neo4j_uri"),
+        ("NEO4J_USER", "neo4j_user"),
+        ("NEO4J_PASSWORD", "neo4j_password"),
+        ("NEO4J_DATABASE", "neo4j_database"),
+        ("NEO4J_MAX_CONNECTION_POOL_SIZE", "neo4j_max_connection_pool_size"),
+        ("NEO4J_CONNECTION_ACQUISITION_TIMEOUT", "neo4j_connection_acquisition_timeout"),
+        ("NEO4J_MAX_CONNECTION_LIFETIME", "neo4j_max_connection_lifetime"),
+        ("NEO4J_CONNECTION_TIMEOUT", "neo4j_connection_timeout"),
+
         # Processing Configuration
-        self.MAX_ENTITIES_PER_NEWSLETTER = settings.max_entities_per_newsletter
-        self.FACT_EXTRACTION_BATCH_SIZE = settings.fact_extraction_batch_size
-        self.PROCESSING_TIMEOUT = settings.processing_timeout
-        self.ENTITY_CONFIDENCE_THRESHOLD = settings.entity_confidence_threshold
-        self.FACT_CONFIDENCE_THRESHOLD = settings.fact_confidence_threshold
-        
+        ("MAX_ENTITIES_PER_NEWSLETTER", "max_entities_per_newsletter"),
+        ("MAX_EXTRACTION_CHARS", "max_extraction_chars"),
+        ("FACT_EXTRACTION_BATCH_SIZE", "fact_extraction_batch_size"),
+        ("PROCESSING_TIMEOUT", "processing_timeout"),
+        ("ENTITY_CONFIDENCE_THRESHOLD", "entity_confidence_threshold"),
+        ("FACT_CONFIDENCE_THRESHOLD", "fact_confidence_threshold"),
+
         # Feature Flags
-        self.ENABLE_DEBUG_MODE = settings.enable_debug_mode
\ No newline at end of file
+        ("ENABLE_DEBUG_MODE", "enable_debug_mode"),
+    ))
+
+    def __getattr__(self, name):
+        try:
+            field = self._FIELDS[name]
+        except KeyError:
+            raise AttributeError(f"'Config' object has no attribute '{name}'") from None
+        return getattr(get_settings(), field)
+
+    def __dir__(self):
+        return [*super().__dir__(), *self._FIELDS]
@@ -1,7 +1,13 @@
 """Neo4j database client and operations."""
-from typing import List, Dict, Any, Optional
+import asyncio
+import re
+import time
+from collections import defaultdict
+from contextlib import aclosing
+from functools import lru_cache
+from typing import List, Dict, Any, AsyncIterator, Optional, Tuple
 from urllib.parse import urlparse
-from neo4j import GraphDatabase
+from neo4j import AsyncGraphDatabase, READ_ACCESS, WRITE_ACCESS
 import structlog
 from datetime import datetime
 from ..models.newsletter import Entity, Newsletter
@@ -9,6 +15,225 @@ from ..config_wrapper import Config
 
 logger = structlog.get_logger()
 
+# Graph schema as (name, DDL) pairs, applied in setup_constraints_and_indexes
+CONSTRAINTS_AND_INDEXES = (
+    # Unique constraints
+    ("unique_org_name", "CREATE CONSTRAINT unique_org_name IF NOT EXISTS FOR (o:Organization) REQUIRE o.name IS UNIQUE"),
+    ("unique_person_name", "CREATE CONSTRAINT unique_person_name IF NOT EXISTS FOR (p:Person) REQUIRE p.name IS UNIQUE"),
+    ("unique_product_name", "CREATE CONSTRAINT unique_product_name IF NOT EXISTS FOR (pr:Product) REQUIRE pr.name IS UNIQUE"),
+    ("unique_event_name", "CREATE CONSTRAINT unique_event_name IF NOT EXISTS FOR (e:Event) REQUIRE e.name IS UNIQUE"),
+    ("unique_location_name", "CREATE CONSTRAINT unique_location_name IF NOT EXISTS FOR (l:Location) REQUIRE l.name IS UNIQUE"),
+    ("unique_topic_name", "CREATE CONSTRAINT unique_topic_name IF NOT EXISTS FOR (t:Topic) REQUIRE t.name IS UNIQUE"),
+    ("unique_newsletter_id", "CREATE CONSTRAINT unique_newsletter_id IF NOT EXISTS FOR (n:Newsletter) REQUIRE n.id IS UNIQUE"),
+    
+    # Performance indexes
+    ("newsletter_date_idx", "CREATE INDEX newsletter_date_idx IF NOT EXISTS FOR (n:Newsletter) ON (n.received_date)"),
+    ("entity_confidence_idx", "CREATE INDEX entity_confidence_idx IF NOT EXISTS FOR (e:Organization) ON (e.confidence)"),
+    ("entity_last_seen_idx", "CREATE INDEX entity_last_seen_idx IF NOT EXISTS FOR (e:Organization) ON (e.last_seen)"),
+    
+    # Fulltext index for entity resolution
+    ("entity_name_ft", "CREATE FULLTEXT INDEX entity_name_ft IF NOT EXISTS "
+                       "FOR (e:Organization|Person|Product|Event|Location|Topic) ON EACH [e.name, e.aliases]"),
+)
+
+# The range indexes and uniqueness constraints above as apoc.schema.assert
+# maps, so they can be asserted in one call when APOC is installed
+SCHEMA_INDEXES = {
+    "Newsletter": [["received_date"]],
+    "Organization": [["confidence"], ["last_seen"]],
+}
+SCHEMA_CONSTRAINTS = {
+    "Organization": ["name"],
+    "Person": ["name"],
+    "Product": ["name"],
+    "Event": ["name"],
+    "Location": ["name"],
+    "Topic": ["name"],
+    "Newsletter": ["id"],
+}
+# Schema that apoc.schema.assert cannot express, always created with DDL
+_NON_APOC_SCHEMA = frozenset({"entity_name_ft"})
+
+_APOC_SCHEMA_ASSERT = """
+CALL apoc.schema.assert($indexes, $constraints, false) YIELD label, key, action
+RETURN label, key, action
+"""
+
+# Entity node labels. Entity types coming from the LLM are looked up here
+# rather than interpolated into Cypher, so each operation has a fixed query
+# text per label that the server can plan once and cache.
+ENTITY_TYPES = ("Organization", "Person", "Product", "Event", "Location", "Topic")
+
+_ENTITY_MERGE = """
+MERGE (e:{label} {{name: row.name}})
+ON CREATE SET 
+    e.created_at = datetime(),
+    e.last_seen = datetime(),
+    e.confidence = row.confidence,
+    e.aliases = row.aliases,
+    e.mention_count = 1,
+    e.properties_json = row.properties_json
+ON MATCH SET
+    e.last_seen = datetime(),
+    e.mention_count = e.mention_count + 1,
+    e.confidence = CASE 
+        WHEN row.confidence > e.confidence THEN row.confidence 
+        ELSE e.confidence 
+    END
+"""
+
+# Only ON CREATE leaves mention_count at 1, so this needs no timestamp comparison
+_ENTITY_OPERATION = "CASE WHEN e.mention_count = 1 THEN 'created' ELSE 'updated' END"
+
+_UPSERT_ENTITIES_QUERY = (
+    "UNWIND $rows AS row"
+    + _ENTITY_MERGE
+    + "RETURN e.name as name,\n       " + _ENTITY_OPERATION + " as operation\n"
+)
+
+_LINK_ENTITIES_QUERY = """
+MATCH (n:Newsletter {{id: $newsletter_id}})
+UNWIND $rows AS row
+MATCH (e:{label} {{name: row.name}})
+MERGE (e)-[r:MENTIONED_IN]->(n)
+ON CREATE SET
+    r.date = datetime(),
+    r.context = row.context
+"""
+
+# Fulltext lookup over entity names and aliases (index created in
+# setup_constraints_and_indexes); filtered to the requested entity type
+SIMILAR_ENTITIES_QUERY = """
+CALL db.index.fulltext.queryNodes('entity_name_ft', $search_query) YIELD node, score
+WHERE $entity_type IN labels(node)
+RETURN node as e, 
+       node.mention_count as popularity,
+       node.confidence as confidence
+ORDER BY score DESC, popularity DESC, confidence DESC
+LIMIT 10
+"""
+
+# Characters with special meaning in Lucene query syntax
+_LUCENE_SPECIAL_CHARS = re.compile(r'([+\-&|!(){}\[\]^"~*?:\\/])')
+
+
+def _render_per_label(template: str) -> Dict[str, str]:
+    """Render a Cypher template once for each entity label."""
+    return {label: template.format(label=label) for label in ENTITY_TYPES}
+
+
+# Read-only query results are served from memory for this many seconds
+READ_CACHE_TTL_SECONDS = 30.0
+READ_CACHE_MAX_ENTRIES = 1024
+
+# A successful health probe is trusted for this many seconds
+HEALTH_CHECK_TTL_SECONDS = 2.0
+
+UPSERT_ENTITIES_QUERIES = _render_per_label(_UPSERT_ENTITIES_QUERY)
+LINK_ENTITIES_QUERIES = _render_per_label(_LINK_ENTITIES_QUERY)
+
+_NEWSLETTER_MERGE = """
+MERGE (n:Newsletter {id: $newsletter_id})
+ON CREATE SET
+    n.subject = $subject,
+    n.sender = $sender,
+    n.received_date = $received_date,
+    n.created_at = datetime(),
+    n.content_length = $content_length
+"""
+
+# Newsletter node, entity upserts and MENTIONED_IN links in one statement.
+# Each entity row is routed to the branch for its label, so no label is
+# ever interpolated from input.
+_INGEST_ENTITY_BRANCH = (
+    "WITH n, row\n"
+    "WITH n, row WHERE row.type = '{label}'"
+    + _ENTITY_MERGE
+    + "MERGE (e)-[r:MENTIONED_IN]->(n)\n"
+    "ON CREATE SET\n"
+    "    r.date = datetime(),\n"
+    "    r.context = row.context\n"
+    "RETURN " + _ENTITY_OPERATION + " as operation\n"
+)
+
+INGEST_NEWSLETTER_QUERY = (
+    _NEWSLETTER_MERGE
+    + "WITH n\n"
+    "UNWIND $entities AS row\n"
+    "CALL {\n"
+    + "UNION ALL\n".join(_INGEST_ENTITY_BRANCH.format(label=label) for label in ENTITY_TYPES)
+    + "}\n"
+    "RETURN row.name as name, row.type as type, operation\n"
+)
+
+# Unfiltered label/relationship counts are answered from the count store
+GRAPH_STATS_QUERY = """
+RETURN
+    COUNT { (:Organization) } as organizations,
+    COUNT { (:Person) } as people,
+    COUNT { (:Product) } as products,
+    COUNT { (:Event) } as events,
+    COUNT { (:Location) } as locations,
+    COUNT { (:Topic) } as topics,
+    COUNT { (:Newsletter) } as newsletters,
+    COUNT { ()-[]->() } as relationships
+"""
+
+# Pooled connections opened on connect, so a burst of first requests does not
+# queue behind Bolt/TLS handshakes
+WARMUP_CONNECTIONS = 4
+
+# Every fixed query text the client sends, planned on connect so the first
+# real request hits the server's plan cache
+WARMUP_QUERIES = (
+    *UPSERT_ENTITIES_QUERIES.values(),
+    *LINK_ENTITIES_QUERIES.values(),
+    _NEWSLETTER_MERGE,
+    INGEST_NEWSLETTER_QUERY,
+    SIMILAR_ENTITIES_QUERY,
+    GRAPH_STATS_QUERY,
+)
+
+
+async def _fetch_records(tx, query: str, parameters: dict, hydrate: bool = True) -> List[Dict]:
+    """
+    Transaction function returning all records as dicts.
+    
+    With hydrate=False records are copied shallowly, skipping the recursive
+    conversion of nodes and relationships; use it for scalar-only results.
+    """
+    result = await tx.run(query, parameters)
+    if hydrate:
+        return await result.data()
+    return [dict(record) async for record in result]
+
+
+async def _fetch_many(tx, queries: List[Tuple[str, dict]]) -> List[List[Dict]]:
+    """Transaction function running several queries, returning each one's records."""
+    results = []
+    for query, parameters in queries:
+        results.append(await _fetch_records(tx, query, parameters or {}))
+    return results
+
+
+async def _consume_counters(tx, query: str, parameters: dict) -> Dict[str, int]:
+    """Transaction function discarding records and returning update counters."""
+    result = await tx.run(query, parameters)
+    summary = await result.consume()
+    counters = summary.counters
+    return {
+        'nodes_created': counters.nodes_created,
+        'relationships_created': counters.relationships_created,
+        'properties_set': counters.properties_set
+    }
+
+
+@lru_cache(maxsize=8)
+def _sanitized_uri(uri: str) -> str:
+    """Connection URI reduced to scheme, host and port for logging (parsed once per URI)."""
+    parsed_uri = urlparse(uri)
+    return f"{parsed_uri.scheme}://{parsed_uri.hostname}:{parsed_uri.port or 7687}"
+
 
 class Neo4jClient:
     """Neo4j database client for graph operations."""
@@ -16,215 +241,417 @@ class Neo4jClient:
     def __init__(self, config: Config):
         self.config = config
         self.driver = None
+        # (query name, *args) -> (expires_at, result)
+        self._read_cache: Dict[tuple, tuple] = {}
+        # time.monotonic() of the last successful health probe
+        self._last_health_ok_at: Optional[float] = None
         
-    def connect(self) -> bool:
+    async def connect(self) -> bool:
         """Establish connection to Neo4j."""
+        if self.driver:
+            logger.warning("Neo4j client already connected, reusing existing driver")
+            return True
+        
         try:
             # Log connection details (without password)
-            parsed_uri = urlparse(self.config.NEO4J_URI)
-            sanitized_uri = f"{parsed_uri.scheme}://{parsed_uri.hostname}:{parsed_uri.port}"
             logger.info("Attempting Neo4j connection", 
-                       uri=sanitized_uri,
+                       uri=_sanitized_uri(self.config.NEO4J_URI),
                        user=self.config.NEO4J_USER,
                        password_length=len(self.config.NEO4J_PASSWORD) if self.config.NEO4J_PASSWORD else 0)
             
-            self.driver = GraphDatabase.driver(
+            self.driver = AsyncGraphDatabase.driver(
                 self.config.NEO4J_URI, 
-                auth=(self.config.NEO4J_USER, self.config.NEO4J_PASSWORD)
+                auth=(self.config.NEO4J_USER, self.config.NEO4J_PASSWORD),
+                max_connection_pool_size=self.config.NEO4J_MAX_CONNECTION_POOL_SIZE,
+                connection_acquisition_timeout=self.config.NEO4J_CONNECTION_ACQUISITION_TIMEOUT,
+                max_connection_lifetime=self.config.NEO4J_MAX_CONNECTION_LIFETIME,
+                connection_timeout=self.config.NEO4J_CONNECTION_TIMEOUT
             )
             # Test connection
-            with self.driver.session() as session:
-                result = session.run("RETURN 1 as test")
-                result.single()
+            await self.driver.verify_connectivity()
             logger.info("Neo4j connection established")
+            await self._warm_plan_cache()
             return True
         except Exception as e:
             logger.error("Neo4j connection failed", error=str(e))
+            await self.close()
             return False
     
-    def close(self):
+    async def _warm_plan_cache(self):
+        """
+        Plan each canonical query with EXPLAIN (nothing is executed).
+        
+        The queries are spread over concurrent sessions, each holding its own
+        connection, which also fills the connection pool.
+        """
+        connections = min(WARMUP_CONNECTIONS, self.config.NEO4J_MAX_CONNECTION_POOL_SIZE, len(WARMUP_QUERIES))
+        
+        async def explain_all(queries) -> int:
+            warmed = 0
+            async with self._session() as session:
+                for query in queries:
+                    try:
+                        result = await session.run("EXPLAIN " + query)
+                        await result.consume()
+                        warmed += 1
+                    except Exception as e:
+                        logger.debug("Query plan warmup failed", query=query[:100], error=str(e))
+            return warmed
+        
+        warmed = await asyncio.gather(*(explain_all(WARMUP_QUERIES[i::connections]) 
+                                        for i in range(connections)))
+        logger.info("Query plan cache warmed", queries=sum(warmed), total=len(WARMUP_QUERIES),
+                    connections=connections)
+    
+    async def get_connection_health(self) -> Dict[str, Any]:
+        """Check the Neo4j connection, reusing a recent successful probe."""
+        if not self.driver:
+            return {'is_healthy': False, 'error': "No Neo4j connection"}
+        
+        if (self._last_health_ok_at is not None 
+                and time.monotonic() - self._last_health_ok_at < HEALTH_CHECK_TTL_SECONDS):
+            return {'is_healthy': True, 'cached': True}
+        
+        try:
+            # Checks out a pooled connection without opening a session or transaction
+            await self.driver.verify_connectivity()
+        except Exception as e:
+            self._last_health_ok_at = None
+            logger.warning("Neo4j health check failed", error=str(e))
+            return {'is_healthy': False, 'error': str(e)}
+        
+        self._last_health_ok_at = time.monotonic()
+        return {'is_healthy': True, 'cached': False}
+    
+    async def close(self):
         """Close Neo4j connection."""
         if self.driver:
-            self.driver.close()
+            await self.driver.close()
+            self.driver = None
             logger.info("Neo4j connection closed")
     
-    def execute_query(self, query: str, parameters: dict = None) -> Optional[List[Dict]]:
-        """Execute a Cypher query."""
+    def _session(self, read_only: bool = False):
+        """
+        Open a session on the configured database.
+        
+        Read sessions can be routed to follower replicas. All sessions share the
+        driver's bookmark manager so reads observe earlier writes.
+        """
+        return self.driver.session(
+            database=self.config.NEO4J_DATABASE,
+            default_access_mode=READ_ACCESS if read_only else WRITE_ACCESS,
+            bookmark_manager=self.driver.execute_query_bookmark_manager
+        )
+    
+    async def execute_query(self, query: str, parameters: dict = None, 
+                            read_only: bool = False, hydrate: bool = True) -> Optional[List[Dict]]:
+        """Execute a Cypher query in a managed transaction (retried on transient errors)."""
         if not self.driver:
             logger.error("No Neo4j connection")
             return None
         
         try:
-            with self.driver.session(database=self.config.NEO4J_DATABASE) as session:
-                result = session.run(query, parameters or {})
-                return result.data()
+            async with self._session(read_only) as session:
+                if read_only:
+                    return await session.execute_read(_fetch_records, query, parameters or {}, hydrate)
+                return await session.execute_write(_fetch_records, query, parameters or {}, hydrate)
         except Exception as e:
             logger.error("Query execution failed", query=query[:100], error=str(e))
             return None
     
-    def setup_constraints_and_indexes(self):
+    async def execute_many(self, queries: List[Tuple[str, dict]]) -> Optional[List[List[Dict]]]:
+        """
+        Execute several Cypher queries in one session and one write transaction.
+        
+        Use instead of looping over execute_query when the queries form one
+        unit of work; they commit or roll back together.
+        """
+        if not self.driver:
+            logger.error("No Neo4j connection")
+            return None
+        
+        try:
+            async with self._session() as session:
+                return await session.execute_write(_fetch_many, list(queries))
+        except Exception as e:
+            logger.error("Query batch execution failed", queries=len(queries), error=str(e))
+            return None
+    
+    async def execute_write(self, query: str, parameters: dict = None) -> Optional[Dict[str, int]]:
+        """Execute a Cypher write whose records are not needed, returning its update counters."""
+        if not self.driver:
+            logger.error("No Neo4j connection")
+            return None
+        
+        try:
+            async with self._session() as session:
+                return await session.execute_write(_consume_counters, query, parameters or {})
+        except Exception as e:
+            logger.error("Write execution failed", query=query[:100], error=str(e))
+            return None
+    
+    def _cache_get(self, key: tuple) -> Any:
+        """Return a cached read result, or None if missing or expired."""
+        entry = self._read_cache.get(key)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+    
+    def _cache_set(self, key: tuple, value: Any):
+        """Cache a read result, evicting the oldest entry when full."""
+        if len(self._read_cache) >= READ_CACHE_MAX_ENTRIES:
+            self._read_cache.pop(next(iter(self._read_cache)))
+        self._read_cache[key] = (time.monotonic() + READ_CACHE_TTL_SECONDS, value)
+    
+    def invalidate_cache(self):
+        """Drop cached read results after the graph has been written to."""
+        self._read_cache.clear()
+    
+    async def setup_constraints_and_indexes(self):
         """Create constraints and indexes for optimal graph performance."""
         if not self.driver:
             logger.error("No Neo4j connection available")
             return
         
-        constraints_and_indexes = [
-            # Unique constraints
-            "CREATE CONSTRAINT unique_org_name IF NOT EXISTS FOR (o:Organization) REQUIRE o.name IS UNIQUE",
-            "CREATE CONSTRAINT unique_person_name IF NOT EXISTS FOR (p:Person) REQUIRE p.name IS UNIQUE",
-            "CREATE CONSTRAINT unique_product_name IF NOT EXISTS FOR (pr:Product) REQUIRE pr.name IS UNIQUE",
-            "CREATE CONSTRAINT unique_event_name IF NOT EXISTS FOR (e:Event) REQUIRE e.name IS UNIQUE",
-            "CREATE CONSTRAINT unique_location_name IF NOT EXISTS FOR (l:Location) REQUIRE l.name IS UNIQUE",
-            "CREATE CONSTRAINT unique_topic_name IF NOT EXISTS FOR (t:Topic) REQUIRE t.name IS UNIQUE",
-            "CREATE CONSTRAINT unique_newsletter_id IF NOT EXISTS FOR (n:Newsletter) REQUIRE n.id IS UNIQUE",
-            
-            # Performance indexes
-            "CREATE INDEX newsletter_date_idx IF NOT EXISTS FOR (n:Newsletter) ON (n.received_date)",
-            "CREATE INDEX entity_confidence_idx IF NOT EXISTS FOR (e:Organization) ON (e.confidence)",
-            "CREATE INDEX entity_last_seen_idx IF NOT EXISTS FOR (e:Organization) ON (e.last_seen)",
-        ]
-        
         logger.info("Setting up graph constraints and indexes")
         
-        for constraint in constraints_and_indexes:
+        async with self._session() as session:
+            statements = CONSTRAINTS_AND_INDEXES
             try:
-                self.execute_query(constraint)
-                constraint_name = constraint.split()[2]
-                logger.info("Constraint/index created", name=constraint_name)
+                result = await session.run(
+                    _APOC_SCHEMA_ASSERT, 
+                    {'indexes': SCHEMA_INDEXES, 'constraints': SCHEMA_CONSTRAINTS}
+                )
+                actions = await result.data()
+                logger.info("Constraints/indexes asserted with APOC", count=len(actions))
+                statements = [(name, ddl) for name, ddl in statements if name in _NON_APOC_SCHEMA]
             except Exception as e:
-                logger.warning("Constraint/index creation failed", 
-                             constraint=constraint.split()[2], 
-                             error=str(e))
+                logger.info("APOC schema assert unavailable, creating schema per statement", 
+                           error=str(e))
+            
+            for name, statement in statements:
+                try:
+                    result = await session.run(statement)
+                    await result.consume()
+                    logger.info("Constraint/index created", name=name)
+                except Exception as e:
+                    logger.warning("Constraint/index creation failed", 
+                                 constraint=name, 
+                                 error=str(e))
     
-    def create_or_update_entity(self, entity: Entity) -> Optional[Dict]:
+    async def create_or_update_entity(self, entity: Entity) -> Optional[Dict]:
         """Create or update an entity node in the graph."""
-        # Convert properties to a JSON string if not empty, otherwise set to null
-        import json
-        properties_json = json.dumps(entity.properties) if entity.properties else None
-        
-        query = f"""
-        MERGE (e:{entity.type} {{name: $name}})
-        ON CREATE SET 
-            e.created_at = datetime(),
-            e.confidence = $confidence,
-            e.aliases = $aliases,
-            e.mention_count = 1,
-            e.properties_json = $properties_json
-        ON MATCH SET
-            e.last_seen = datetime(),
-            e.mention_count = e.mention_count + 1,
-            e.confidence = CASE 
-                WHEN $confidence > e.confidence THEN $confidence 
-                ELSE e.confidence 
-            END
-        RETURN e, 
-               CASE WHEN e.created_at = e.last_seen THEN 'created' ELSE 'updated' END as operation
-        """
+        results = await self.create_or_update_entities_batch([entity])
+        return results[0] if results else None
+    
+    async def create_or_update_entities_batch(self, entities: List[Entity]) -> List[Dict]:
+        """Create or update entity nodes using one UNWIND query per entity type."""
+        rows_by_type: Dict[str, List[Dict]] = defaultdict(list)
+        for entity in entities:
+            if entity.type not in UPSERT_ENTITIES_QUERIES:
+                logger.warning("Skipping entity with unsupported type", 
+                             name=entity.name, entity_type=entity.type)
+                continue
+            rows_by_type[entity.type].append({
+                'name': entity.name,
+                'confidence': entity.confidence,
+                'aliases': entity.aliases,
+                'properties_json': entity.properties_json
+            })
         
-        parameters = {
-            'name': entity.name,
-            'confidence': entity.confidence,
-            'aliases': entity.aliases,
-            'properties_json': properties_json
-        }
+        results = []
+        if rows_by_type:
+            self.invalidate_cache()
+        for entity_type, rows in rows_by_type.items():
+            result = await self.execute_query(
+                UPSERT_ENTITIES_QUERIES[entity_type], {'rows': rows}, hydrate=False
+            )
+            for record in result or []:
+                record['type'] = entity_type
+                results.append(record)
         
-        result = self.execute_query(query, parameters)
-        return result[0] if result else None
+        return results
     
-    def create_newsletter_node(self, newsletter: Newsletter) -> Optional[Dict]:
-        """Create a newsletter node in the graph."""
-        query = """
-        MERGE (n:Newsletter {id: $newsletter_id})
-        ON CREATE SET
-            n.subject = $subject,
-            n.sender = $sender,
-            n.received_date = $received_date,
-            n.created_at = datetime(),
-            n.content_length = $content_length
-        RETURN n
-        """
-        
-        parameters = {
+    @staticmethod
+    def _newsletter_parameters(newsletter: Newsletter) -> Dict[str, Any]:
+        """Build query parameters for a newsletter node."""
+        return {
             'newsletter_id': newsletter.newsletter_id,
             'subject': newsletter.subject,
             'sender': newsletter.sender,
             'received_date': newsletter.received_date.isoformat() if newsletter.received_date else None,
-            'content_length': len(newsletter.html_content)
+            'content_length': newsletter.content_length
         }
+    
+    async def create_newsletter_node(self, newsletter: Newsletter) -> Optional[Dict]:
+        """Create a newsletter node in the graph."""
+        self.invalidate_cache()
+        return await self.execute_write(_NEWSLETTER_MERGE, self._newsletter_parameters(newsletter))
+    
+    async def bulk_create_newsletters(self, newsletters: List[Newsletter]) -> List[Optional[Dict]]:
+        """
+        Create many newsletter nodes concurrently, e.g. for a backfill.
         
-        result = self.execute_query(query, parameters)
-        return result[0] if result else None
+        Writes run on separate pooled sessions; fan-out is capped at half the
+        connection pool so other requests can still acquire connections.
+        """
+        semaphore = asyncio.Semaphore(max(1, self.config.NEO4J_MAX_CONNECTION_POOL_SIZE // 2))
+        
+        async def create(newsletter: Newsletter) -> Optional[Dict]:
+            async with semaphore:
+                return await self.create_newsletter_node(newsletter)
+        
+        return await asyncio.gather(*(create(newsletter) for newsletter in newsletters))
     
-    def link_entity_to_newsletter(self, entity_name: str, entity_type: str, 
+    async def ingest_newsletter(self, newsletter: Newsletter, 
+                                entities: List[Entity]) -> Optional[List[Dict]]:
+        """
+        Store a newsletter with its entities and MENTIONED_IN links in one transaction.
+        
+        Returns one record per stored entity (name, type, operation), or None if
+        the transaction failed and was rolled back.
+        """
+        rows = []
+        for entity in entities:
+            if entity.type not in ENTITY_TYPES:
+                logger.warning("Skipping entity with unsupported type", 
+                             name=entity.name, entity_type=entity.type)
+                continue
+            rows.append({
+                'name': entity.name,
+                'type': entity.type,
+                'confidence': entity.confidence,
+                'aliases': entity.aliases,
+                'properties_json': entity.properties_json,
+                'context': entity.context
+            })
+        
+        parameters = self._newsletter_parameters(newsletter)
+        parameters['entities'] = rows
+        
+        self.invalidate_cache()
+        return await self.execute_query(INGEST_NEWSLETTER_QUERY, parameters, hydrate=False)
+    
+    async def link_entity_to_newsletter(self, entity_name: str, entity_type: str, 
                                  newsletter_id: str, context: str = None) -> Optional[Dict]:
         """Create a MENTIONED_IN relationship between entity and newsletter."""
-        query = f"""
-        MATCH (e:{entity_type} {{name: $entity_name}})
-        MATCH (n:Newsletter {{id: $newsletter_id}})
-        MERGE (e)-[r:MENTIONED_IN]->(n)
-        ON CREATE SET
-            r.date = datetime(),
-            r.context = $context
-        RETURN r
-        """
+        query = LINK_ENTITIES_QUERIES.get(entity_type)
+        if not query:
+            logger.warning("Unsupported entity type", entity_type=entity_type)
+            return None
         
         parameters = {
-            'entity_name': entity_name,
             'newsletter_id': newsletter_id,
-            'context': context
+            'rows': [{'name': entity_name, 'context': context}]
         }
         
-        result = self.execute_query(query, parameters)
-        return result[0] if result else None
+        self.invalidate_cache()
+        return await self.execute_write(query, parameters)
+    
+    async def link_entities_to_newsletter_batch(self, entities: List[Entity], 
+                                                newsletter_id: str) -> int:
+        """Create MENTIONED_IN relationships for many entities, returning how many were new."""
+        rows_by_type: Dict[str, List[Dict]] = defaultdict(list)
+        for entity in entities:
+            if entity.type in LINK_ENTITIES_QUERIES:
+                rows_by_type[entity.type].append({
+                    'name': entity.name,
+                    'context': entity.context
+                })
+        
+        linked = 0
+        if rows_by_type:
+            self.invalidate_cache()
+        for entity_type, rows in rows_by_type.items():
+            parameters = {'newsletter_id': newsletter_id, 'rows': rows}
+            counters = await self.execute_write(LINK_ENTITIES_QUERIES[entity_type], parameters)
+            if counters:
+                linked += counters['relationships_created']
+        
+        return linked
     
-    def find_similar_entities(self, entity_name: str, entity_type: str, 
+    @staticmethod
+    def _similar_entities_parameters(entity_name: str, entity_type: str) -> Optional[Dict[str, str]]:
+        """Build fulltext search parameters, or None if there is nothing to search."""
+        if entity_type not in ENTITY_TYPES:
+            logger.warning("Unsupported entity type", entity_type=entity_type)
+            return None
+        
+        # Escape Lucene syntax and lowercase so AND/OR/NOT are matched as words
+        search_query = _LUCENE_SPECIAL_CHARS.sub(r'\\\1', entity_name).strip().lower()
+        if not search_query:
+            return None
+        return {'search_query': search_query, 'entity_type': entity_type}
+    
+    async def iter_similar_entities(self, entity_name: str, 
+                                    entity_type: str) -> AsyncIterator[Dict]:
+        """
+        Yield entities with similar names, best match first.
+        
+        Records are pulled from the server as the caller iterates, so a caller
+        that only needs the best match can stop after the first one. The read
+        session stays open until the iterator finishes, so callers must
+        aclose() it or iterate inside contextlib.aclosing().
+        """
+        if not self.driver:
+            logger.error("No Neo4j connection")
+            return
+        
+        parameters = self._similar_entities_parameters(entity_name, entity_type)
+        if parameters is None:
+            return
+        
+        async with self._session(read_only=True) as session:
+            result = await session.run(SIMILAR_ENTITIES_QUERY, parameters)
+            async for record in result:
+                yield record.data()
+    
+    async def find_similar_entities(self, entity_name: str, entity_type: str, 
                             similarity_threshold: float = 0.8) -> List[Dict]:
         """Find entities with similar names for resolution."""
-        query = f"""
-        MATCH (e:{entity_type})
-        WHERE e.name CONTAINS $search_term 
-           OR ANY(alias IN e.aliases WHERE alias CONTAINS $search_term)
-           OR $search_term CONTAINS e.name
-        RETURN e, 
-               e.mention_count as popularity,
-               e.confidence as confidence
-        ORDER BY popularity DESC, confidence DESC
-        LIMIT 10
-        """
+        # The search is case-insensitive, so case variants share one cache entry
+        cache_key = ('similar_entities', entity_type, entity_name.strip().lower(),
+                     round(similarity_threshold, 3))
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
         
-        parameters = {'search_term': entity_name}
-        result = self.execute_query(query, parameters)
-        return result or []
+        try:
+            async with aclosing(self.iter_similar_entities(entity_name, entity_type)) as records:
+                result = [record async for record in records]
+        except Exception as e:
+            logger.error("Similar entity lookup failed", error=str(e), entity_name=entity_name)
+            return []
+        
+        self._cache_set(cache_key, result)
+        return result
     
-    def get_graph_stats(self) -> Dict[str, int]:
+    async def get_graph_stats(self) -> Dict[str, int]:
         """Get basic statistics about the graph."""
-        stats_query = """
-        CALL {
-            MATCH (o:Organization) RETURN count(o) as organizations
-        }
-        CALL {
-            MATCH (p:Person) RETURN count(p) as people
-        }
-        CALL {
-            MATCH (pr:Product) RETURN count(pr) as products
-        }
-        CALL {
-            MATCH (e:Event) RETURN count(e) as events
-        }
-        CALL {
-            MATCH (l:Location) RETURN count(l) as locations
-        }
-        CALL {
-            MATCH (t:Topic) RETURN count(t) as topics
-        }
-        CALL {
-            MATCH (n:Newsletter) RETURN count(n) as newsletters
-        }
-        CALL {
-            MATCH ()-[r]->() RETURN count(r) as relationships
-        }
-        RETURN organizations, people, products, events, locations, topics, newsletters, relationships
-        """
+        cached = self._cache_get(('graph_stats',))
+        if cached is not None:
+            return cached
         
-        result = self.execute_query(stats_query)
-        return result[0] if result else {}
\ No newline at end of file
+        result = await self.execute_query(GRAPH_STATS_QUERY, read_only=True, hydrate=False)
+        if not result:
+            return {}
+        self._cache_set(('graph_stats',), result[0])
+        return result[0]
+
+
+# Created on first use and shared by all processors
+_neo4j_client: Optional[Neo4jClient] = None
+
+
+def get_neo4j_client(config: Config) -> Neo4jClient:
+    """Get the process-wide Neo4j client so all callers share one driver and connection pool.
+    
+    The client is built from the first caller's config; asking for it with a
+    different config raises ValueError instead of silently ignoring that config.
+    """
+    global _neo4j_client
+    if _neo4j_client is None:
+        _neo4j_client = Neo4jClient(config)
+    elif _neo4j_client.config is not config:
+        raise ValueError("The shared Neo4j client was created with a different config")
+    return _neo4j_client
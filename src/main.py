@@ -1,12 +1,18 @@
+import asyncio
+import inspect
 import os
 import signal
 import sys
+import threading
+import time
 import logging
 import structlog
 from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, List
 from fastapi import FastAPI
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from .routers import newsletter
+from .security import API_KEY
 
 # Configure structured logging
 logging.basicConfig(
@@ -15,18 +21,20 @@ logging.basicConfig(
 )
 logger = structlog.get_logger(__name__)
 
+# orjson is a hard requirement (see requirements.txt)
+DefaultResponse = ORJSONResponse
+
 # Environment configuration
 ENVIRONMENT = os.getenv("ENVIRONMENT", "production")
 VERSION = os.getenv("VERSION", "1.0.0")
 
-# Global shutdown flag
-shutdown_event = False
+# Global shutdown flag, set from the signal handler
+shutdown_event = threading.Event()
 
 def signal_handler(signum, frame):
     """Handle shutdown signals gracefully."""
-    global shutdown_event
     logger.info(f"Received signal {signum}, initiating graceful shutdown...")
-    shutdown_event = True
+    shutdown_event.set()
 
 # Register signal handlers
 signal.signal(signal.SIGTERM, signal_handler)
@@ -36,204 +44,133 @@ signal.signal(signal.SIGINT, signal_handler)
 async def lifespan(app: FastAPI):
     # Startup
     logger.info(f"Starting FastAPI app - Environment: {ENVIRONMENT}, Version: {VERSION}")
+    if not API_KEY:
+        logger.error("API_KEY is not configured; /newsletter/process will reject every request")
+    # Connect the newsletter processor in the background so the first request
+    # does not pay for it, without holding up startup if Neo4j is slow
+    warmup = asyncio.create_task(newsletter.warm_processor())
     yield
     # Shutdown
     logger.info("Shutting down FastAPI app")
+    warmup.cancel()
     # Cleanup newsletter processor
-    newsletter.shutdown_processor()
+    await newsletter.shutdown_processor()
 
 app = FastAPI(
     title="Arrgh! Newsletter Processing API",
     description="Process newsletters to extract entities and build knowledge graph",
     version=VERSION,
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=DefaultResponse
 )
 
 # Include routers
 app.include_router(newsletter.router)
 
+# Probe and root payloads only depend on module-level settings, so the
+# responses are built once instead of re-serialized on every request
+_ROOT_ENDPOINTS = {
+    "/newsletter/process": "Process a newsletter (POST)",
+    "/newsletter/stats": "Get graph statistics (GET)",
+    "/newsletter/health": "Check service health (GET)",
+    "/docs": "API documentation"
+}
+
+# Add test endpoints only in non-production environments
+if ENVIRONMENT != "production":
+    _ROOT_ENDPOINTS.update({
+        "/test-connectivity": "Test connectivity (GET) - Dev only",
+        "/test-openai": "Test OpenAI connectivity (GET) - Dev only"
+    })
+
+_ROOT_RESPONSE = DefaultResponse({
+    "message": "Arrgh! Newsletter Processing API",
+    "description": "Extract entities from newsletters and build knowledge graphs",
+    "endpoints": _ROOT_ENDPOINTS,
+    "environment": ENVIRONMENT,
+    "version": VERSION
+})
+
+_HEALTHY_RESPONSE = DefaultResponse({
+    "status": "healthy",
+    "environment": ENVIRONMENT,
+    "version": VERSION,
+    "service": "fastapi-cloud-run"
+})
+
+_SHUTTING_DOWN_RESPONSE = DefaultResponse(
+    status_code=503,
+    content={"status": "unhealthy", "message": "Service is shutting down"}
+)
+
+_READY_RESPONSE = DefaultResponse({
+    "status": "ready",
+    "environment": ENVIRONMENT,
+    "version": VERSION
+})
+
+# Readiness is recomputed at most once per window, however often it is probed
+READY_CACHE_TTL_SECONDS = 5.0
+
+# Dependency checks (sync or async callables returning a bool) polled by /ready
+_ready_checks: List[Callable[[], Any]] = []
+_ready_cache: Dict[str, Any] = {"ts": 0.0, "value": None}
+
+def register_ready_check(check: Callable[[], Any]):
+    """Register a dependency check that must pass for the service to be ready."""
+    _ready_checks.append(check)
+    _ready_cache["value"] = None
+
+async def _get_readiness():
+    """Run the registered readiness checks, reusing the result within the TTL."""
+    now = time.monotonic()
+    if _ready_cache["value"] is not None and now - _ready_cache["ts"] < READY_CACHE_TTL_SECONDS:
+        return _ready_cache["value"]
+    
+    failed_checks = []
+    for check in _ready_checks:
+        name = getattr(check, "__name__", repr(check))
+        try:
+            ok = check()
+            if inspect.isawaitable(ok):
+                ok = await ok
+        except Exception as e:
+            logger.warning("Readiness check failed", check=name, error=str(e))
+            ok = False
+        if not ok:
+            failed_checks.append(name)
+    
+    if failed_checks:
+        value = DefaultResponse(
+            status_code=503,
+            content={"status": "not ready", "failed_checks": failed_checks}
+        )
+    else:
+        value = _READY_RESPONSE
+    _ready_cache.update(ts=now, value=value)
+    return value
+
 @app.get("/")
 def read_root():
     logger.info("Root endpoint accessed")
-    endpoints = {
-        "/newsletter/process": "Process a newsletter (POST)",
-        "/newsletter/stats": "Get graph statistics (GET)",
-        "/newsletter/health": "Check service health (GET)",
-        "/docs": "API documentation"
-    }
-    
-    # Add test endpoints only in non-production environments
-    if ENVIRONMENT != "production":
-        endpoints.update({
-            "/test-connectivity": "Test connectivity (GET) - Dev only",
-            "/test-openai": "Test OpenAI connectivity (GET) - Dev only"
-        })
-    
-    return {
-        "message": "Arrgh! Newsletter Processing API",
-        "description": "Extract entities from newsletters and build knowledge graphs",
-        "endpoints": endpoints,
-        "environment": ENVIRONMENT,
-        "version": VERSION
-    }
+    return _ROOT_RESPONSE
 
 @app.get("/health")
 def health_check():
     """Health check endpoint for Cloud Run."""
-    if shutdown_event:
-        return JSONResponse(
-            status_code=503,
-            content={"status": "unhealthy", "message": "Service is shutting down"}
-        )
+    if shutdown_event.is_set():
+        return _SHUTTING_DOWN_RESPONSE
     
-    return {
-        "status": "healthy",
-        "environment": ENVIRONMENT,
-        "version": VERSION,
-        "service": "fastapi-cloud-run"
-    }
+    return _HEALTHY_RESPONSE
 
 @app.get("/ready")
-def readiness_check():
+async def readiness_check():
     """Readiness check endpoint for Cloud Run."""
-    # Add any application-specific readiness checks here
-    # (database connections, external services, etc.)
-    return {
-        "status": "ready",
-        "environment": ENVIRONMENT,
-        "version": VERSION
-    }
+    # Application-specific checks (database connections, external services,
+    # etc.) are added with register_ready_check()
+    return await _get_readiness()
 
 # Test endpoints - only available in non-production environments
 if ENVIRONMENT != "production":
-    @app.get("/test-connectivity")
-    def test_connectivity():
-        """Test connectivity to various ports to debug Cloud Run networking."""
-        from .test_connectivity import run_connectivity_tests
-        
-        logger.info("Running connectivity tests")
-        results = run_connectivity_tests()
-        
-        # Summary
-        total_tests = len(results["tests"])
-        successful_tests = sum(1 for test in results["tests"] if test["success"])
-        
-        return {
-            "summary": {
-                "total_tests": total_tests,
-                "successful": successful_tests,
-                "failed": total_tests - successful_tests
-            },
-            "results": results["tests"],
-            "environment": ENVIRONMENT
-        }
-
-    @app.get("/test-openai")
-    def test_openai_connectivity():
-        """Test OpenAI API connectivity with detailed error reporting."""
-        from .config_wrapper import Config
-        from .processors.entity_extractor import EntityExtractor
-        from openai import OpenAI
-        import traceback
-        
-        logger.info("Testing OpenAI connectivity")
-        
-        try:
-            # Load config
-            config = Config()
-            
-            # Test 1: Basic client initialization
-            test_results = {
-                "config_loaded": bool(config.OPENAI_API_KEY),
-                "api_key_present": bool(config.OPENAI_API_KEY and len(config.OPENAI_API_KEY) > 0),
-                "api_key_format": config.OPENAI_API_KEY[:10] + "..." if config.OPENAI_API_KEY else None,
-                "client_init": False,
-                "simple_request": False,
-                "entity_extractor": False,
-                "errors": []
-            }
-            
-            # Test 2: Initialize OpenAI client directly
-            try:
-                client = OpenAI(
-                    api_key=config.OPENAI_API_KEY,
-                    timeout=10.0
-                )
-                test_results["client_init"] = True
-                logger.info("OpenAI client initialized successfully")
-                
-                # Test 3: Make a simple API call
-                try:
-                    response = client.chat.completions.create(
-                        model="gpt-3.5-turbo",
-                        messages=[{"role": "user", "content": "Say hello"}],
-                        max_tokens=10,
-                        timeout=10
-                    )
-                    test_results["simple_request"] = True
-                    test_results["response_content"] = response.choices[0].message.content
-                    logger.info("Simple OpenAI request successful")
-                except Exception as e:
-                    error_info = {
-                        "test": "simple_request",
-                        "error_type": type(e).__name__,
-                        "error_message": str(e),
-                        "traceback": traceback.format_exc()
-                    }
-                    if hasattr(e, 'status_code'):
-                        error_info["status_code"] = e.status_code
-                    if hasattr(e, 'response'):
-                        error_info["response"] = str(e.response)[:500] if e.response else None
-                    test_results["errors"].append(error_info)
-                    logger.error("Simple OpenAI request failed", **error_info)
-                    
-            except Exception as e:
-                error_info = {
-                    "test": "client_init",
-                    "error_type": type(e).__name__,
-                    "error_message": str(e),
-                    "traceback": traceback.format_exc()
-                }
-                test_results["errors"].append(error_info)
-                logger.error("OpenAI client initialization failed", **error_info)
-            
-            # Test 4: Test EntityExtractor
-            try:
-                extractor = EntityExtractor(config)
-                test_results["entity_extractor"] = bool(extractor.client)
-                if extractor.client:
-                    logger.info("EntityExtractor initialized successfully")
-                else:
-                    logger.error("EntityExtractor client is None")
-            except Exception as e:
-                error_info = {
-                    "test": "entity_extractor",
-                    "error_type": type(e).__name__,
-                    "error_message": str(e),
-                    "traceback": traceback.format_exc()
-                }
-                test_results["errors"].append(error_info)
-                logger.error("EntityExtractor initialization failed", **error_info)
-            
-            return {
-                "summary": {
-                    "all_tests_passed": all([
-                        test_results["config_loaded"],
-                        test_results["api_key_present"],
-                        test_results["client_init"],
-                        test_results["simple_request"],
-                        test_results["entity_extractor"]
-                    ]),
-                    "critical_failures": len([e for e in test_results["errors"] if e["test"] in ["client_init", "simple_request"]])
-                },
-                "results": test_results,
-                "environment": ENVIRONMENT
-            }
-            
-        except Exception as e:
-            logger.error("Test setup failed", error_message=str(e), traceback=traceback.format_exc())
-            return {
-                "summary": {"all_tests_passed": False, "critical_failures": 1},
-                "results": {"setup_error": str(e)},
-                "environment": ENVIRONMENT
-            } 
\ No newline at end of file
+    from .routers import diagnostics
+    app.include_router(diagnostics.router)
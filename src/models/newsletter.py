@@ -1,7 +1,9 @@
 """Newsletter data models."""
-from pydantic import BaseModel, Field
+from functools import cached_property
+from pydantic import BaseModel, Field, model_validator
 from typing import List, Dict, Any, Optional
 from datetime import datetime
+import orjson
 
 
 class Entity(BaseModel):
@@ -12,6 +14,13 @@ class Entity(BaseModel):
     confidence: float = Field(ge=0.0, le=1.0)
     context: Optional[str] = None
     properties: Dict[str, Any] = Field(default_factory=dict)
+    
+    @cached_property
+    def properties_json(self) -> Optional[str]:
+        """Properties serialized for graph storage (computed once per entity), or None if empty."""
+        if not self.properties:
+            return None
+        return orjson.dumps(self.properties, option=orjson.OPT_NON_STR_KEYS).decode()
 
 
 class Fact(BaseModel):
@@ -32,6 +41,14 @@ class Newsletter(BaseModel):
     sender: str
     received_date: Optional[datetime] = None
     newsletter_id: Optional[str] = None
+    content_length: Optional[int] = Field(default=None, ge=0)
+    
+    @model_validator(mode='after')
+    def set_content_length(self):
+        """Record the HTML size once so consumers need not touch the content to measure it."""
+        if self.content_length is None:
+            self.content_length = len(self.html_content)
+        return self
 
 
 class NewsletterProcessingRequest(BaseModel):
@@ -48,6 +65,7 @@ class NewsletterProcessingResponse(BaseModel):
     newsletter_id: str
     processing_time: float
     entities_extracted: int
+    entities_unique: Optional[int] = None  # after merging duplicate name/type pairs
     entities_new: int
     entities_updated: int
     entity_summary: Dict[str, int]
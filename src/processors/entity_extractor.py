@@ -1,14 +1,93 @@
 """Entity extraction using LLM."""
+import asyncio
+import hashlib
+import heapq
 import json
 import os
-from typing import List, Optional
-from openai import OpenAI
+import time
+import weakref
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, OpenAI
+import httpx
+import orjson
 import structlog
 from ..models.newsletter import Entity
 from ..config_wrapper import Config
 
+_json_loads = orjson.loads  # orjson.JSONDecodeError subclasses json.JSONDecodeError
+
 logger = structlog.get_logger()
 
+# Raw LLM responses are reused for identical requests within this window
+LLM_CACHE_TTL_SECONDS = 24 * 60 * 60
+LLM_CACHE_MAX_ENTRIES = 1024
+
+# Models that reject response_format={"type": "json_object"}
+_JSON_MODE_UNSUPPORTED_MODELS = frozenset({'gpt-4', 'gpt-4-0314', 'gpt-4-0613', 'gpt-4-32k'})
+
+# Concurrent LLM requests allowed per batch extraction
+LLM_MAX_CONCURRENT_REQUESTS = 8
+
+
+@lru_cache(maxsize=4)
+def get_openai_client(api_key: str) -> OpenAI:
+    """Get the shared OpenAI client for an API key, reusing its TLS context and connection pool."""
+    # Simple OpenAI client initialization - let Cloud Run handle networking
+    return OpenAI(
+        api_key=api_key,
+        timeout=30.0
+    )
+
+
+# Async clients' connection pools and request semaphores are bound to the event
+# loop that first uses them, so each running loop (e.g. repeated asyncio.run()
+# calls) gets its own
+_loop_resources: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[tuple, Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _loop_resource(key: tuple, factory):
+    """Get the object stored under key for the running event loop, creating it on first use."""
+    resources = _loop_resources.setdefault(asyncio.get_running_loop(), {})
+    if key not in resources:
+        resources[key] = factory()
+    return resources[key]
+
+
+def get_async_openai_client(api_key: str) -> AsyncOpenAI:
+    """Get the shared async OpenAI client for an API key on the running event loop.
+    
+    Requests are multiplexed over HTTP/2 so concurrent extractions share a
+    few connections instead of each opening its own.
+    """
+    return _loop_resource(('client', api_key), lambda: AsyncOpenAI(
+        api_key=api_key,
+        timeout=30.0,
+        http_client=DefaultAsyncHttpxClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=1000, max_keepalive_connections=200)
+        )
+    ))
+
+
+async def close_async_openai_clients():
+    """Close the running event loop's async OpenAI clients (call at shutdown)."""
+    resources = _loop_resources.pop(asyncio.get_running_loop(), {})
+    for key, resource in resources.items():
+        if key[0] == 'client':
+            await resource.close()
+
+
+def get_request_semaphore(api_key: str, limit: int) -> asyncio.Semaphore:
+    """Get the semaphore bounding in-flight async requests for an API key on the running event loop.
+    
+    Shared by every extractor using the key, so concurrent newsletters
+    queue here instead of running into the account's rate limits.
+    """
+    return _loop_resource(('semaphore', api_key, limit), lambda: asyncio.Semaphore(limit))
+
 
 class EntityExtractor:
     """Extract entities from newsletter content using LLM."""
@@ -33,39 +112,47 @@ Extract entities from the following newsletter text and classify them into these
 5. Return results as valid JSON
 
 **Newsletter Content:**
-{content}
+{{CONTENT}}
 
 **Required JSON Format:**
 ```json
-{{
+{
   "entities": [
-    {{
+    {
       "name": "Entity Name",
       "type": "Organization|Person|Product|Event|Location|Topic",
       "aliases": ["Alternative Name 1", "Alternative Name 2"],
       "confidence": 0.95,
       "context": "The sentence or phrase where this entity was mentioned",
-      "properties": {{
+      "properties": {
         "additional_info": "any relevant details"
-      }}
-    }}
+      }
+    }
   ]
-}}
+}
 ```
 
 Return only valid JSON, no additional text.
 """
+    # Filled with str.replace, so the JSON example needs no brace escaping
+    _PROMPT_CONTENT_MARKER = "{{CONTENT}}"
+    
+    # Appended to content cut at MAX_EXTRACTION_CHARS
+    TRUNCATION_SUFFIX = "..."
+    
+    # Shared by every request; never mutated
+    _SYSTEM_MESSAGE = {"role": "system", "content": "You are an expert entity extractor. Return only valid JSON."}
 
     def __init__(self, config: Config):
         self.config = config
         self.client = None
+        # request digest -> (expires_at, raw response text)
+        self._response_cache: Dict[str, tuple] = {}
+        self._cache_hits = 0
+        self._cache_misses = 0
         if config.OPENAI_API_KEY:
             try:
-                # Simple OpenAI client initialization - let Cloud Run handle networking
-                self.client = OpenAI(
-                    api_key=config.OPENAI_API_KEY,
-                    timeout=30.0
-                )
+                self.client = get_openai_client(config.OPENAI_API_KEY)
                 
                 logger.info("OpenAI client initialized successfully")
                 
@@ -75,130 +162,251 @@ Return only valid JSON, no additional text.
         else:
             logger.warning("OpenAI API key not configured")
     
+    def _completion_request(self, content: str) -> Dict[str, Any]:
+        """Build chat completion arguments for extracting entities from content."""
+        # Truncate content if too long (sized to the model's context window)
+        max_content_length = self.config.MAX_EXTRACTION_CHARS
+        original_length = len(content)
+        if original_length > max_content_length:
+            content = content[:max_content_length] + self.TRUNCATION_SUFFIX
+            logger.info("Content truncated for entity extraction", 
+                      original_length=original_length, 
+                      truncated_length=max_content_length)
+        
+        # Create prompt
+        prompt = self.ENTITY_EXTRACTION_PROMPT.replace(self._PROMPT_CONTENT_MARKER, content)
+        
+        request = {
+            "model": self.config.LLM_MODEL,
+            "messages": [
+                self._SYSTEM_MESSAGE,
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": self.config.LLM_TEMPERATURE,
+            "max_tokens": self.config.LLM_MAX_TOKENS
+        }
+        if self.config.LLM_MODEL not in _JSON_MODE_UNSUPPORTED_MODELS:
+            # JSON mode: the model must return a single valid JSON object
+            request["response_format"] = {"type": "json_object"}
+        return request
+    
+    @staticmethod
+    def _extract_json_text(result_text: str) -> str:
+        """Recover the JSON object from a response wrapped in code fences or prose."""
+        # Extract JSON from response (handle various formats)
+        _, fence, tail = result_text.partition("```json")
+        if not fence:
+            _, fence, tail = result_text.partition("```")
+        if fence:
+            result_text, _, _ = tail.partition("```")
+        
+        # Try to extract JSON from various response formats
+        result_text = result_text.strip()
+        
+        # If response doesn't start with {, try to find JSON object
+        if not result_text.startswith('{'):
+            # Look for JSON object starting with {
+            start_idx = result_text.find('{')
+            if start_idx != -1:
+                # Find the matching closing brace
+                brace_count = 0
+                end_idx = start_idx
+                for i, char in enumerate(result_text[start_idx:], start_idx):
+                    if char == '{':
+                        brace_count += 1
+                    elif char == '}':
+                        brace_count -= 1
+                        if brace_count == 0:
+                            end_idx = i + 1
+                            break
+                result_text = result_text[start_idx:end_idx]
+            else:
+                # If no JSON object found, try to construct one
+                if '"entities"' in result_text or 'entities' in result_text:
+                    logger.warning("Response contains 'entities' but no valid JSON structure", 
+                                 response_snippet=result_text[:100])
+                    # Return empty result to avoid crash
+                    result_text = '{"entities": []}'
+        
+        return result_text
+    
+    def _parse_entities(self, result_text: str) -> List[Entity]:
+        """Parse the LLM response text into entities (raises json.JSONDecodeError)."""
+        # Log a truncated response for debugging
+        logger.debug("Raw OpenAI response (truncated)", response_snippet=result_text[:200])
+        
+        try:
+            # JSON mode responses are a bare JSON object
+            result = _json_loads(result_text)
+        except json.JSONDecodeError:
+            result = _json_loads(self._extract_json_text(result_text))
+        
+        # Convert to Entity objects
+        entities = []
+        for entity_data in result.get('entities', []):
+            # Validate required fields
+            name = entity_data.get('name')
+            entity_type = entity_data.get('type')
+            if not name or not entity_type or not isinstance(name, str) or not isinstance(entity_type, str):
+                continue
+            
+            # Skip out-of-range confidences and filter by confidence threshold
+            confidence = entity_data.get('confidence', 0.0)
+            if not isinstance(confidence, (int, float)) or not 0.0 <= confidence <= 1.0:
+                continue
+            if confidence < self.config.ENTITY_CONFIDENCE_THRESHOLD:
+                continue
+            
+            aliases = entity_data.get('aliases')
+            context = entity_data.get('context')
+            properties = entity_data.get('properties')
+            if isinstance(aliases, list):
+                # Neo4j rejects mixed-type list properties, so keep only the strings
+                aliases = [alias for alias in aliases if isinstance(alias, str)]
+            else:
+                aliases = []
+            
+            # Every field is checked or coerced here, so skip re-validating them in pydantic
+            entity = Entity.model_construct(
+                name=name,
+                type=entity_type,
+                aliases=aliases,
+                confidence=float(confidence),
+                context=context if isinstance(context, str) else None,
+                properties=properties if isinstance(properties, dict) else {}
+            )
+            entities.append(entity)
+        
+        # Limit entities to configured maximum
+        total_extracted = len(entities)
+        if total_extracted > self.config.MAX_ENTITIES_PER_NEWSLETTER:
+            entities = heapq.nlargest(self.config.MAX_ENTITIES_PER_NEWSLETTER, entities,
+                                      key=lambda e: e.confidence)
+            logger.info("Entities limited to maximum", 
+                      total_extracted=total_extracted,
+                      limit=self.config.MAX_ENTITIES_PER_NEWSLETTER)
+        
+        logger.info("Entities extracted successfully", count=len(entities))
+        return entities
+    
+    @staticmethod
+    def _log_extraction_error(e: Exception, response=None):
+        """Log a failed extraction with as much detail as the error carries."""
+        response_snippet = response.choices[0].message.content[:200] if response is not None else "unavailable"
+        
+        if isinstance(e, json.JSONDecodeError):
+            logger.error("Failed to parse LLM response as JSON", 
+                        error=str(e), 
+                        response_snippet=response_snippet)
+            return
+        
+        # Log detailed error information for debugging
+        error_details = {
+            "error_type": type(e).__name__,
+            "error_message": str(e),
+            "response_snippet": response_snippet
+        }
+        
+        # Add more details for specific exception types
+        if hasattr(e, 'status_code'):
+            error_details["status_code"] = e.status_code
+        if hasattr(e, 'response'):
+            error_details["response_text"] = str(e.response)[:500] if e.response else "None"
+        if hasattr(e, '__cause__') and e.__cause__:
+            error_details["underlying_cause"] = str(e.__cause__)
+            
+        logger.error("Error extracting entities", **error_details)
+    
+    @staticmethod
+    def _response_cache_key(request: Dict[str, Any]) -> str:
+        """Digest of everything that determines the LLM response."""
+        payload = json.dumps(request, sort_keys=True)
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+    
+    def _cached_response(self, key: str) -> Optional[str]:
+        """Return a cached raw response, or None on a miss."""
+        entry = self._response_cache.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            self._response_cache.pop(key, None)
+            self._cache_misses += 1
+            logger.debug("LLM response cache miss", hits=self._cache_hits, misses=self._cache_misses)
+            return None
+        self._cache_hits += 1
+        logger.info("LLM response cache hit", hits=self._cache_hits, misses=self._cache_misses)
+        return entry[1]
+    
+    def _cache_response(self, key: str, result_text: str):
+        """Store a raw response that parsed successfully."""
+        if len(self._response_cache) >= LLM_CACHE_MAX_ENTRIES:
+            self._response_cache.pop(next(iter(self._response_cache)))
+        self._response_cache[key] = (time.monotonic() + LLM_CACHE_TTL_SECONDS, result_text)
+    
     def extract_entities(self, content: str) -> List[Entity]:
         """Extract entities from content using LLM."""
         if not self.client:
             logger.error("OpenAI client not initialized")
             return []
         
+        response = None
         try:
-            # Truncate content if too long
-            max_content_length = 3000
-            if len(content) > max_content_length:
-                content = content[:max_content_length] + "..."
-                logger.info("Content truncated for entity extraction", 
-                          original_length=len(content), 
-                          truncated_length=max_content_length)
-            
-            # Create prompt
-            prompt = self.ENTITY_EXTRACTION_PROMPT.format(content=content)
-            
-            # Get LLM response
-            response = self.client.chat.completions.create(
-                model=self.config.LLM_MODEL,
-                messages=[
-                    {"role": "system", "content": "You are an expert entity extractor. Return only valid JSON."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=self.config.LLM_TEMPERATURE,
-                max_tokens=self.config.LLM_MAX_TOKENS
-            )
-            
-            # Parse JSON response
-            result_text = response.choices[0].message.content
-            
-            # Log a truncated response for debugging
-            logger.debug("Raw OpenAI response (truncated)", response_snippet=result_text[:200])
-            
-            # Extract JSON from response (handle various formats)
-            if "```json" in result_text:
-                result_text = result_text.split("```json")[1].split("```")[0]
-            elif "```" in result_text:
-                result_text = result_text.split("```")[1].split("```")[0]
-            
-            # Try to extract JSON from various response formats
-            result_text = result_text.strip()
-            
-            # If response doesn't start with {, try to find JSON object
-            if not result_text.startswith('{'):
-                # Look for JSON object starting with {
-                start_idx = result_text.find('{')
-                if start_idx != -1:
-                    # Find the matching closing brace
-                    brace_count = 0
-                    end_idx = start_idx
-                    for i, char in enumerate(result_text[start_idx:], start_idx):
-                        if char == '{':
-                            brace_count += 1
-                        elif char == '}':
-                            brace_count -= 1
-                            if brace_count == 0:
-                                end_idx = i + 1
-                                break
-                    result_text = result_text[start_idx:end_idx]
-                else:
-                    # If no JSON object found, try to construct one
-                    if '"entities"' in result_text or 'entities' in result_text:
-                        logger.warning("Response contains 'entities' but no valid JSON structure", 
-                                     response_snippet=result_text[:100])
-                        # Return empty result to avoid crash
-                        result_text = '{"entities": []}'
-            
-            result = json.loads(result_text)
-            
-            # Convert to Entity objects
-            entities = []
-            for entity_data in result.get('entities', []):
-                # Validate required fields
-                if not entity_data.get('name') or not entity_data.get('type'):
-                    continue
-                
-                # Filter by confidence threshold
-                confidence = entity_data.get('confidence', 0.0)
-                if confidence < self.config.ENTITY_CONFIDENCE_THRESHOLD:
-                    continue
-                    
-                entity = Entity(
-                    name=entity_data['name'],
-                    type=entity_data['type'],
-                    aliases=entity_data.get('aliases', []),
-                    confidence=confidence,
-                    context=entity_data.get('context'),
-                    properties=entity_data.get('properties', {})
-                )
-                entities.append(entity)
-            
-            # Limit entities to configured maximum
-            if len(entities) > self.config.MAX_ENTITIES_PER_NEWSLETTER:
-                entities = sorted(entities, key=lambda e: e.confidence, reverse=True)
-                entities = entities[:self.config.MAX_ENTITIES_PER_NEWSLETTER]
-                logger.info("Entities limited to maximum", 
-                          total_extracted=len(entities),
-                          limit=self.config.MAX_ENTITIES_PER_NEWSLETTER)
-            
-            logger.info("Entities extracted successfully", count=len(entities))
+            request = self._completion_request(content)
+            key = self._response_cache_key(request)
+            result_text = self._cached_response(key)
+            if result_text is None:
+                # Get LLM response
+                response = self.client.chat.completions.create(**request)
+                result_text = response.choices[0].message.content
+            entities = self._parse_entities(result_text)
+            if response is not None:
+                self._cache_response(key, result_text)
             return entities
-            
-        except json.JSONDecodeError as e:
-            logger.error("Failed to parse LLM response as JSON", 
-                        error=str(e), 
-                        response_snippet=result_text[:200] if 'result_text' in locals() else "unavailable")
+        except Exception as e:
+            self._log_extraction_error(e, response)
             return []
+    
+    async def extract_entities_async(self, content: str) -> List[Entity]:
+        """Extract entities from content using LLM without blocking the event loop."""
+        if not self.client:
+            logger.error("OpenAI client not initialized")
+            return []
+        
+        response = None
+        try:
+            request = self._completion_request(content)
+            key = self._response_cache_key(request)
+            result_text = self._cached_response(key)
+            if result_text is None:
+                # Get LLM response
+                client = get_async_openai_client(self.config.OPENAI_API_KEY)
+                semaphore = get_request_semaphore(self.config.OPENAI_API_KEY,
+                                                  self.config.OPENAI_MAX_CONCURRENCY)
+                queued = semaphore.locked()
+                wait_start = time.monotonic()
+                async with semaphore:
+                    if queued:
+                        logger.info("Waited for LLM request slot", 
+                                  wait_seconds=round(time.monotonic() - wait_start, 3))
+                    response = await client.chat.completions.create(**request)
+                result_text = response.choices[0].message.content
+            entities = self._parse_entities(result_text)
+            if response is not None:
+                self._cache_response(key, result_text)
+            return entities
         except Exception as e:
-            # Log detailed error information for debugging
-            error_details = {
-                "error_type": type(e).__name__,
-                "error_message": str(e),
-                "response_snippet": response.choices[0].message.content[:200] if 'response' in locals() else "unavailable"
-            }
-            
-            # Add more details for specific exception types
-            if hasattr(e, 'status_code'):
-                error_details["status_code"] = e.status_code
-            if hasattr(e, 'response'):
-                error_details["response_text"] = str(e.response)[:500] if e.response else "None"
-            if hasattr(e, '__cause__') and e.__cause__:
-                error_details["underlying_cause"] = str(e.__cause__)
-                
-            logger.error("Error extracting entities", **error_details)
-            return []
\ No newline at end of file
+            self._log_extraction_error(e, response)
+            return []
+    
+    async def extract_entities_batch(self, contents: List[str], 
+                                     max_concurrency: int = LLM_MAX_CONCURRENT_REQUESTS) -> List[List[Entity]]:
+        """
+        Extract entities from several contents with concurrent LLM requests.
+        
+        Returns one entity list per content, in input order.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def extract(content: str) -> List[Entity]:
+            async with semaphore:
+                return await self.extract_entities_async(content)
+        
+        return await asyncio.gather(*(extract(content) for content in contents))
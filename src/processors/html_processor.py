@@ -1,35 +1,109 @@
-"""HTML processing utilities for newsletter content."""
-from bs4 import BeautifulSoup
-import html2text
-from typing import Dict, List, Any
+"""HTML processing utilities for newsletter content.
+
+The parsing libraries are imported on first use to keep them out of app startup.
+"""
+import asyncio
+import copy
+import hashlib
+from collections import OrderedDict
+from concurrent.futures import Executor
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple
 import structlog
 
 logger = structlog.get_logger()
 
+HEADER_TAGS = frozenset({'h1', 'h2', 'h3', 'h4', 'h5', 'h6'})
+
+# Results kept per function for repeated (e.g. forwarded) newsletters
+HTML_CACHE_MAX_ENTRIES = 256
+
+
+class _ContentCache:
+    """LRU cache keyed by a digest of the HTML, so large documents are never held as keys."""
+    
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: bytes) -> Optional[Any]:
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+    
+    def set(self, key: bytes, value: Any):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+    
+    def clear(self):
+        self.entries.clear()
+        self.hits = self.misses = 0
+    
+    def info(self) -> Dict[str, int]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self.entries),
+            'max_entries': self.max_entries
+        }
+
+
+_clean_cache = _ContentCache(HTML_CACHE_MAX_ENTRIES)
+_sections_cache = _ContentCache(HTML_CACHE_MAX_ENTRIES)
+
+
+def _content_key(html_content: str) -> bytes:
+    """Digest identifying HTML content."""
+    return hashlib.blake2b(html_content.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+
+def cache_info() -> Dict[str, Dict[str, int]]:
+    """Hit/miss counters and sizes of the HTML processing caches."""
+    return {
+        'clean_html_content': _clean_cache.info(),
+        'extract_text_sections': _sections_cache.info()
+    }
+
+
+def clear_caches():
+    """Drop all cached HTML processing results."""
+    _clean_cache.clear()
+    _sections_cache.clear()
+
 
 def clean_html_content(html_content: str) -> str:
-    """Clean and extract text from HTML content."""
+    """Clean and extract text from HTML content (cached by content digest)."""
+    import html2text
+    
+    key = _content_key(html_content)
+    cached = _clean_cache.get(key)
+    if cached is not None:
+        return cached
+    
     try:
-        # Parse HTML with BeautifulSoup
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-        # Remove script and style elements
-        for script in soup(["script", "style"]):
-            script.decompose()
-        
-        # Convert to text using html2text for better formatting
+        # Convert to text using html2text for better formatting. It parses the
+        # HTML once and drops script and style content itself.
         h = html2text.HTML2Text()
         h.ignore_links = False
         h.ignore_images = True
         h.body_width = 0  # Don't wrap lines
         
         # Get text content
-        text_content = h.handle(str(soup))
+        text_content = h.handle(html_content)
         
         # Clean up extra whitespace
         cleaned_text = ' '.join(text_content.split())
         
         logger.info("HTML content cleaned", content_length=len(cleaned_text))
+        _clean_cache.set(key, cleaned_text)
         return cleaned_text
     
     except Exception as e:
@@ -37,39 +111,116 @@ def clean_html_content(html_content: str) -> str:
         return ""
 
 
-def extract_text_sections(html_content: str) -> Dict[str, Any]:
-    """Extract different sections of the newsletter."""
+@lru_cache(maxsize=1)
+def _section_xpaths() -> Tuple[Any, Any, Any]:
+    """Header, paragraph and link queries, compiled once per process on first use."""
+    from lxml import etree
+    
+    return (
+        etree.XPath('//h1|//h2|//h3|//h4|//h5|//h6'),
+        etree.XPath('//p'),
+        etree.XPath('//a[@href]')
+    )
+
+
+def _lxml_sections(html_content: str) -> Dict[str, Any]:
+    """Collect the sections with lxml's HTML parser and XPath, keeping traversal in C."""
+    import lxml.html
+    from lxml import etree
+    
+    sections = {
+        'title': '',
+        'headers': [],
+        'paragraphs': [],
+        'links': []
+    }
+    
     try:
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-        sections = {
-            'title': '',
-            'headers': [],
-            'paragraphs': [],
-            'links': []
-        }
-        
-        # Extract title
-        title_tag = soup.find('title') or soup.find('h1')
-        if title_tag:
-            sections['title'] = title_tag.get_text().strip()
-        
-        # Extract headers
-        for header in soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
-            sections['headers'].append(header.get_text().strip())
-        
-        # Extract paragraphs
-        for para in soup.find_all('p'):
-            text = para.get_text().strip()
+        # Parse UTF-8 bytes so documents with an XML encoding declaration are accepted
+        root = lxml.html.document_fromstring(
+            html_content.encode('utf-8', 'replace'), parser=lxml.html.HTMLParser(encoding='utf-8')
+        )
+    except etree.ParserError:
+        # Empty (or comment-only) documents have no sections
+        return sections
+    
+    headers_xpath, paragraphs_xpath, links_xpath = _section_xpaths()
+    sections['headers'] = [element.text_content().strip() for element in headers_xpath(root)]
+    for element in paragraphs_xpath(root):
+        text = element.text_content().strip()
+        if text:
+            sections['paragraphs'].append(text)
+    sections['links'] = [{'text': element.text_content().strip(), 'url': element.get('href')}
+                         for element in links_xpath(root)]
+    
+    # Extract title
+    title_tag = root.find('.//title')
+    if title_tag is None:
+        title_tag = root.find('.//h1')
+    if title_tag is not None:
+        sections['title'] = title_tag.text_content().strip()
+    
+    return sections
+
+
+def _soup_sections(html_content: str) -> Dict[str, Any]:
+    """Collect the sections with BeautifulSoup's pure-Python html.parser (used without lxml)."""
+    from bs4 import BeautifulSoup, Tag
+    
+    soup = BeautifulSoup(html_content, 'html.parser')
+    
+    sections = {
+        'title': '',
+        'headers': [],
+        'paragraphs': [],
+        'links': []
+    }
+    
+    # Walk the tree once, dispatching each tag to its section
+    title_tag = first_h1 = None
+    for element in soup.descendants:
+        if not isinstance(element, Tag):
+            continue
+        name = element.name
+        if name in HEADER_TAGS:
+            sections['headers'].append(element.get_text().strip())
+            if name == 'h1' and first_h1 is None:
+                first_h1 = element
+        elif name == 'p':
+            text = element.get_text().strip()
             if text:
                 sections['paragraphs'].append(text)
-        
-        # Extract links
-        for link in soup.find_all('a', href=True):
-            sections['links'].append({
-                'text': link.get_text().strip(),
-                'url': link['href']
-            })
+        elif name == 'a':
+            url = element.get('href')
+            if url is not None:
+                sections['links'].append({
+                    'text': element.get_text().strip(),
+                    'url': url
+                })
+        elif name == 'title' and title_tag is None:
+            title_tag = element
+    
+    # Extract title
+    title_tag = title_tag or first_h1
+    if title_tag:
+        sections['title'] = title_tag.get_text().strip()
+    
+    return sections
+
+
+def extract_text_sections(html_content: str) -> Dict[str, Any]:
+    """Extract different sections of the newsletter (cached by content digest)."""
+    key = _content_key(html_content)
+    cached = _sections_cache.get(key)
+    if cached is not None:
+        # Callers get their own copy of the nested lists
+        return copy.deepcopy(cached)
+    
+    try:
+        try:
+            sections = _lxml_sections(html_content)
+        except ImportError:
+            sections = _soup_sections(html_content)
         
         logger.info(
             "Text sections extracted",
@@ -78,8 +229,34 @@ def extract_text_sections(html_content: str) -> Dict[str, Any]:
             links_count=len(sections['links'])
         )
         
+        _sections_cache.set(key, copy.deepcopy(sections))
         return sections
     
     except Exception as e:
         logger.error("Error extracting sections", error=str(e))
-        return {}
\ No newline at end of file
+        return {}
+
+
+def process_html(html_content: str) -> Tuple[str, Dict[str, Any]]:
+    """Clean the HTML and extract its sections in a single call."""
+    return clean_html_content(html_content), extract_text_sections(html_content)
+
+
+async def process_html_in_executor(html_content: str, executor: Executor) -> Tuple[str, Dict[str, Any]]:
+    """
+    Run process_html in an executor (e.g. a process pool), so CPU-bound parsing
+    does not hold this process's GIL. Repeats are served from this process's caches.
+    """
+    key = _content_key(html_content)
+    cleaned_text = _clean_cache.get(key)
+    sections = _sections_cache.get(key)
+    if cleaned_text is not None and sections is not None:
+        return cleaned_text, copy.deepcopy(sections)
+    
+    loop = asyncio.get_running_loop()
+    cleaned_text, sections = await loop.run_in_executor(executor, process_html, html_content)
+    if cleaned_text:
+        _clean_cache.set(key, cleaned_text)
+    if sections:
+        _sections_cache.set(key, copy.deepcopy(sections))
+    return cleaned_text, sections
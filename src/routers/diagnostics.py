@@ -0,0 +1,155 @@
+"""Diagnostic endpoints, only mounted in non-production environments."""
+import os
+import threading
+import time
+import traceback
+from fastapi import APIRouter
+import structlog
+from ..config_wrapper import Config
+from ..processors.entity_extractor import EntityExtractor, get_openai_client
+from ..test_connectivity import run_connectivity_tests
+
+logger = structlog.get_logger()
+
+ENVIRONMENT = os.getenv("ENVIRONMENT", "production")
+
+# Create router
+router = APIRouter(tags=["diagnostics"])
+
+config = Config()
+
+# Connectivity results are served from cache for this long unless ?refresh=true
+CONNECTIVITY_CACHE_TTL_SECONDS = 300.0
+
+_connectivity_cache = {"ts": 0.0, "value": None}
+# Concurrent requests wait for one probe run instead of each starting their own
+_connectivity_lock = threading.Lock()
+
+
+@router.get("/test-connectivity")
+def test_connectivity(refresh: bool = False):
+    """Test connectivity to various ports to debug Cloud Run networking."""
+    with _connectivity_lock:
+        cached = _connectivity_cache["value"]
+        age = time.monotonic() - _connectivity_cache["ts"]
+        if cached is not None and not refresh and age < CONNECTIVITY_CACHE_TTL_SECONDS:
+            return {**cached, "cached": True, "age_seconds": round(age, 1)}
+        
+        logger.info("Running connectivity tests")
+        results = run_connectivity_tests()
+        
+        # Summary
+        total_tests = len(results["tests"])
+        successful_tests = sum(1 for test in results["tests"] if test["success"])
+        
+        value = {
+            "summary": {
+                "total_tests": total_tests,
+                "successful": successful_tests,
+                "failed": total_tests - successful_tests
+            },
+            "results": results["tests"],
+            "environment": ENVIRONMENT
+        }
+        _connectivity_cache.update(ts=time.monotonic(), value=value)
+    return {**value, "cached": False, "age_seconds": 0.0}
+
+
+@router.get("/test-openai")
+def test_openai_connectivity():
+    """Test OpenAI API connectivity with detailed error reporting."""
+    logger.info("Testing OpenAI connectivity")
+    
+    try:
+        # Test 1: Basic client initialization
+        test_results = {
+            "config_loaded": bool(config.OPENAI_API_KEY),
+            "api_key_present": bool(config.OPENAI_API_KEY and len(config.OPENAI_API_KEY) > 0),
+            "api_key_format": config.OPENAI_API_KEY[:10] + "..." if config.OPENAI_API_KEY else None,
+            "client_init": False,
+            "simple_request": False,
+            "entity_extractor": False,
+            "errors": []
+        }
+        
+        # Test 2: Get the shared OpenAI client (with a shorter timeout for this check)
+        try:
+            client = get_openai_client(config.OPENAI_API_KEY).with_options(timeout=10.0)
+            test_results["client_init"] = True
+            logger.info("OpenAI client initialized successfully")
+            
+            # Test 3: Make a simple API call
+            try:
+                response = client.chat.completions.create(
+                    model="gpt-3.5-turbo",
+                    messages=[{"role": "user", "content": "Say hello"}],
+                    max_tokens=10,
+                    timeout=10
+                )
+                test_results["simple_request"] = True
+                test_results["response_content"] = response.choices[0].message.content
+                logger.info("Simple OpenAI request successful")
+            except Exception as e:
+                error_info = {
+                    "test": "simple_request",
+                    "error_type": type(e).__name__,
+                    "error_message": str(e),
+                    "traceback": traceback.format_exc()
+                }
+                if hasattr(e, 'status_code'):
+                    error_info["status_code"] = e.status_code
+                if hasattr(e, 'response'):
+                    error_info["response"] = str(e.response)[:500] if e.response else None
+                test_results["errors"].append(error_info)
+                logger.error("Simple OpenAI request failed", **error_info)
+        
+        except Exception as e:
+            error_info = {
+                "test": "client_init",
+                "error_type": type(e).__name__,
+                "error_message": str(e),
+                "traceback": traceback.format_exc()
+            }
+            test_results["errors"].append(error_info)
+            logger.error("OpenAI client initialization failed", **error_info)
+        
+        # Test 4: Test EntityExtractor
+        try:
+            extractor = EntityExtractor(config)
+            test_results["entity_extractor"] = bool(extractor.client)
+            if extractor.client:
+                logger.info("EntityExtractor initialized successfully")
+            else:
+                logger.error("EntityExtractor client is None")
+        except Exception as e:
+            error_info = {
+                "test": "entity_extractor",
+                "error_type": type(e).__name__,
+                "error_message": str(e),
+                "traceback": traceback.format_exc()
+            }
+            test_results["errors"].append(error_info)
+            logger.error("EntityExtractor initialization failed", **error_info)
+        
+        return {
+            "summary": {
+                "all_tests_passed": all([
+                    test_results["config_loaded"],
+                    test_results["api_key_present"],
+                    test_results["client_init"],
+                    test_results["simple_request"],
+                    test_results["entity_extractor"]
+                ]),
+                "critical_failures": len([e for e in test_results["errors"] if e["test"] in ["client_init", "simple_request"]])
+            },
+            "results": test_results,
+            "environment": ENVIRONMENT
+        }
+    
+    except Exception as e:
+        logger.error("Test setup failed", error_message=str(e), traceback=traceback.format_exc())
+        return {
+            "summary": {"all_tests_passed": False, "critical_failures": 1},
+            "results": {"setup_error": str(e)},
+            "environment": ENVIRONMENT
+        }
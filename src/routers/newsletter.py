@@ -1,11 +1,12 @@
 """Newsletter processing API endpoints."""
+import asyncio
 from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends
 from typing import Dict
 import structlog
 from ..models.newsletter import NewsletterProcessingRequest, NewsletterProcessingResponse
-from ..workflows.newsletter_processor import NewsletterProcessor
 from ..config_wrapper import Config
 from ..security import get_api_key
+from ..processors.html_processor import cache_info as html_cache_info
 
 logger = structlog.get_logger()
 
@@ -21,22 +22,43 @@ config = None
 processor = None
 initialized = False
 
+# Serializes first-time initialization so concurrent requests share one processor
+_init_lock = asyncio.Lock()
 
-def ensure_initialized():
-    """Ensure processor is initialized."""
+
+async def get_processor():
+    """Get the shared newsletter processor, initializing it on first use."""
     global initialized, config, processor
-    if not initialized:
-        config = Config()
-        processor = NewsletterProcessor(config)
-        if processor.initialize():
+    if initialized:
+        return processor
+    async with _init_lock:
+        if not initialized:
+            # Imported on first use: the workflow pulls in the OpenAI, Neo4j and
+            # HTML parsing stacks, which would otherwise slow app startup
+            from ..workflows.newsletter_processor import NewsletterProcessor
+            
+            # Kept across failed attempts: the shared Neo4j client is bound to it
+            if config is None:
+                config = Config()
+            processor = NewsletterProcessor(config)
+            if not await processor.initialize():
+                raise HTTPException(status_code=503, detail="Newsletter processor initialization failed")
             initialized = True
             logger.info("Newsletter processor initialized")
-        else:
-            raise HTTPException(status_code=503, detail="Newsletter processor initialization failed")
+    return processor
+
+
+async def warm_processor():
+    """Initialize the processor ahead of the first request (failures are retried on demand)."""
+    try:
+        await get_processor()
+    except Exception as e:
+        logger.warning("Newsletter processor warm-up failed", error=str(e))
 
 
 @router.post("/process", response_model=NewsletterProcessingResponse, dependencies=[Depends(get_api_key)])
-async def process_newsletter(request: NewsletterProcessingRequest):
+async def process_newsletter(request: NewsletterProcessingRequest, background_tasks: BackgroundTasks,
+                             defer_storage: bool = False, processor=Depends(get_processor)):
     """
     Process a newsletter through the entity extraction pipeline.
     
@@ -46,12 +68,13 @@ async def process_newsletter(request: NewsletterProcessingRequest):
     3. Stores entities in Neo4j graph database
     4. Creates relationships between entities and newsletter
     5. Returns processing summary
-    """
-    ensure_initialized()
     
+    With ?defer_storage=true, steps 3-4 run after the response is sent
+    (status "accepted"); poll /newsletter/{newsletter_id}/status for the result.
+    """
     try:
         logger.info("Processing newsletter", subject=request.subject, sender=request.sender)
-        response = processor.process_newsletter(request)
+        response = await processor.process_newsletter(request, defer_storage=defer_storage)
         
         if response.status == "error":
             logger.error("Newsletter processing failed", errors=response.errors)
@@ -60,6 +83,9 @@ async def process_newsletter(request: NewsletterProcessingRequest):
                 "errors": response.errors
             })
         
+        if response.status == "accepted":
+            background_tasks.add_task(processor.store_pending, response.newsletter_id)
+        
         return response
         
     except HTTPException:
@@ -73,7 +99,7 @@ async def process_newsletter(request: NewsletterProcessingRequest):
 
 
 @router.get("/stats")
-async def get_graph_stats() -> Dict[str, int]:
+async def get_graph_stats(processor=Depends(get_processor)) -> Dict[str, int]:
     """
     Get current statistics from the graph database.
     
@@ -87,10 +113,8 @@ async def get_graph_stats() -> Dict[str, int]:
     - Newsletters
     - Relationships
     """
-    ensure_initialized()
-    
     try:
-        stats = processor.get_graph_stats()
+        stats = await processor.get_graph_stats()
         logger.info("Graph stats retrieved", stats=stats)
         return stats
         
@@ -102,20 +126,35 @@ async def get_graph_stats() -> Dict[str, int]:
         })
 
 
+@router.get("/{newsletter_id}/status", dependencies=[Depends(get_api_key)])
+async def get_storage_status(newsletter_id: str, processor=Depends(get_processor)) -> Dict:
+    """
+    Get the graph storage status of a newsletter processed with defer_storage.
+    
+    Status is one of "pending", "stored" or "failed" (with errors). Statuses
+    are held in memory by the instance that processed the newsletter.
+    """
+    status = processor.get_storage_status(newsletter_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="No deferred storage found for newsletter")
+    return status
+
+
 @router.get("/health")
 async def health_check():
     """Check health of newsletter processing service."""
     try:
-        ensure_initialized()
+        processor = await get_processor()
         
         # Check Neo4j connection
-        stats = processor.get_graph_stats()
+        health = await processor.get_connection_health()
         
         return {
-            "status": "healthy",
+            "status": "healthy" if health["is_healthy"] else "unhealthy",
             "initialized": initialized,
-            "neo4j_connected": True,
-            "entity_confidence_threshold": config.ENTITY_CONFIDENCE_THRESHOLD
+            "neo4j_connected": health["is_healthy"],
+            "entity_confidence_threshold": config.ENTITY_CONFIDENCE_THRESHOLD,
+            "html_cache": html_cache_info()
         }
         
     except Exception as e:
@@ -129,10 +168,10 @@ async def health_check():
 
 
 # Cleanup on shutdown
-def shutdown_processor():
+async def shutdown_processor():
     """Shutdown processor connections."""
     global initialized
     if initialized:
-        processor.shutdown()
+        await processor.shutdown()
         initialized = False
         logger.info("Newsletter processor shutdown")
\ No newline at end of file
@@ -1,4 +1,4 @@
-
+import hmac
 import os
 from fastapi import Security, HTTPException, status
 from fastapi.security import APIKeyHeader
@@ -6,15 +6,19 @@ from fastapi.security import APIKeyHeader
 API_KEY = os.environ.get("API_KEY")
 API_KEY_NAME = "X-API-Key"
 
+# Encoded once for the constant-time comparison in get_api_key
+_API_KEY_BYTES = API_KEY.encode() if API_KEY else None
+
 api_key_header = APIKeyHeader(name=API_KEY_NAME, auto_error=False)
 
 async def get_api_key(api_key_header: str = Security(api_key_header)):
-    if not API_KEY:
+    if not _API_KEY_BYTES:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="API_KEY not configured on server",
         )
-    if api_key_header == API_KEY:
+    # compare_digest takes the same time wherever the first mismatch is
+    if api_key_header and hmac.compare_digest(api_key_header.encode(), _API_KEY_BYTES):
         return api_key_header
     else:
         raise HTTPException(
@@ -1,17 +1,35 @@
 """Test Cloud Run connectivity to various ports."""
 import socket
 import time
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Tuple
 import structlog
 
 logger = structlog.get_logger()
 
+# Resolved addresses are reused for this long across diagnostic runs
+DNS_CACHE_TTL_SECONDS = 60.0
+
+# host -> (expires_at, getaddrinfo results without a port)
+_dns_cache: Dict[str, Tuple[float, List[tuple]]] = {}
+
+
+def _resolve(host: str, port: int) -> List[tuple]:
+    """Resolve host:port for TCP (IPv4 and IPv6), reusing recent lookups of the host."""
+    entry = _dns_cache.get(host)
+    if entry is None or entry[0] <= time.monotonic():
+        # One lookup per host serves every port probed on it
+        entry = (time.monotonic() + DNS_CACHE_TTL_SECONDS,
+                 socket.getaddrinfo(host, None, socket.AF_UNSPEC, socket.SOCK_STREAM))
+        _dns_cache[host] = entry
+    # IPv6 socket addresses carry flow info and scope id after the port
+    return [(family, socktype, proto, canonname, (sockaddr[0], port, *sockaddr[2:]))
+            for family, socktype, proto, canonname, sockaddr in entry[1]]
+
 
 def test_port_connectivity(host: str, port: int, timeout: int = 5) -> Dict[str, Any]:
     """Test TCP connectivity to a host:port combination."""
     start_time = time.time()
-    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    sock.settimeout(timeout)
     
     result = {
         "host": host,
@@ -23,16 +41,30 @@ def test_port_connectivity(host: str, port: int, timeout: int = 5) -> Dict[str,
     }
     
     try:
-        # Resolve hostname
-        ip_address = socket.gethostbyname(host)
-        result["resolved_ip"] = ip_address
-        logger.info(f"Resolved {host} to {ip_address}")
+        # Resolve hostname (IPv4 and IPv6)
+        addresses = _resolve(host, port)
+        result["resolved_ip"] = addresses[0][4][0]
+        logger.info(f"Resolved {host} to {result['resolved_ip']}")
         
-        # Try to connect
-        sock.connect((ip_address, port))
-        result["success"] = True
-        result["response_time"] = time.time() - start_time
-        logger.info(f"Successfully connected to {host}:{port}")
+        # Try each resolved address in order, using its own address family
+        for family, socktype, proto, _, sockaddr in addresses:
+            sock = socket.socket(family, socktype, proto)
+            sock.settimeout(timeout)
+            try:
+                sock.connect(sockaddr)
+            except OSError as e:
+                connect_error = e
+                continue
+            finally:
+                sock.close()
+            
+            result["resolved_ip"] = sockaddr[0]
+            result["success"] = True
+            result["response_time"] = time.time() - start_time
+            logger.info(f"Successfully connected to {host}:{port}")
+            break
+        else:
+            raise connect_error
         
     except socket.gaierror as e:
         result["error"] = f"DNS resolution failed: {str(e)}"
@@ -46,9 +78,6 @@ def test_port_connectivity(host: str, port: int, timeout: int = 5) -> Dict[str,
         result["error"] = f"Connection failed: {str(e)}"
         logger.error(f"Connection failed to {host}:{port}: {str(e)}")
         
-    finally:
-        sock.close()
-        
     return result
 
 
@@ -79,11 +108,27 @@ def run_connectivity_tests() -> Dict[str, Any]:
         "tests": []
     }
     
-    for host, port, description in tests:
-        logger.info(f"Testing {description} - {host}:{port}")
-        test_result = test_port_connectivity(host, port)
-        test_result["description"] = description
-        results["tests"].append(test_result)
+    # Probes of the same host run back to back so they share one DNS lookup
+    tests_by_host: Dict[str, List[Tuple[int, int, str]]] = {}
+    for index, (host, port, description) in enumerate(tests):
+        tests_by_host.setdefault(host, []).append((index, port, description))
+    
+    def run_host_tests(host: str) -> List[Tuple[int, Dict[str, Any]]]:
+        host_results = []
+        for index, port, description in tests_by_host[host]:
+            logger.info(f"Testing {description} - {host}:{port}")
+            test_result = test_port_connectivity(host, port)
+            test_result["description"] = description
+            host_results.append((index, test_result))
+        return host_results
+    
+    # Hosts are probed in parallel, so the run takes as long as the slowest host
+    ordered = [None] * len(tests)
+    with ThreadPoolExecutor(max_workers=len(tests_by_host)) as executor:
+        for host_results in executor.map(run_host_tests, tests_by_host):
+            for index, test_result in host_results:
+                ordered[index] = test_result
+    results["tests"].extend(ordered)
         
     return results
 
@@ -1,29 +1,80 @@
 """Newsletter processing workflow."""
+import multiprocessing
+import os
+import time
 import uuid
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timezone
-from typing import Dict, List
+from typing import Dict, List, Optional
 import structlog
 from ..models.newsletter import (
     Newsletter, Entity, ExtractionState, 
     NewsletterProcessingRequest, NewsletterProcessingResponse
 )
-from ..processors.html_processor import clean_html_content, extract_text_sections
-from ..processors.entity_extractor import EntityExtractor
-from ..graph.neo4j_client import Neo4jClient
+from ..processors.html_processor import process_html_in_executor
+from ..processors.entity_extractor import EntityExtractor, close_async_openai_clients
+from ..graph.neo4j_client import ENTITY_TYPES, Neo4jClient, get_neo4j_client
 from ..config_wrapper import Config
 
 logger = structlog.get_logger()
 
+# Storage statuses kept for newsletters processed with defer_storage
+STORAGE_STATUS_MAX_ENTRIES = 1024
+
+# Longest combined context kept when duplicate entities are merged
+MAX_MERGED_CONTEXT_LENGTH = 500
+
+# Worker processes for HTML parsing, so concurrent newsletters use separate cores
+HTML_WORKER_PROCESSES = os.process_cpu_count() or 1
+
+# Created on first use and shared by all processors
+_html_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_html_pool() -> ProcessPoolExecutor:
+    """Get the shared HTML parsing process pool."""
+    global _html_pool
+    if _html_pool is None:
+        # Spawned rather than forked: the server process runs threads
+        _html_pool = ProcessPoolExecutor(
+            max_workers=HTML_WORKER_PROCESSES,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _html_pool
+
+
+def _discard_html_pool(pool: ProcessPoolExecutor):
+    """Drop a broken pool so the next get_html_pool() starts fresh workers."""
+    global _html_pool
+    # Concurrent requests may all see the same pool break; only the first replaces it
+    if _html_pool is pool:
+        _html_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_html_pool():
+    """Stop the HTML parsing worker processes."""
+    global _html_pool
+    if _html_pool is not None:
+        _html_pool.shutdown(cancel_futures=True)
+        _html_pool = None
+
 
 class NewsletterProcessor:
     """Process newsletters through the complete pipeline."""
     
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, neo4j_client: Optional[Neo4jClient] = None):
         self.config = config
         self.entity_extractor = None
-        self.neo4j_client = Neo4jClient(config)
+        self.neo4j_client = neo4j_client if neo4j_client is not None else get_neo4j_client(config)
+        # newsletter_id -> extraction state awaiting its graph write
+        self._pending_storage: Dict[str, ExtractionState] = {}
+        # newsletter_id -> storage status, oldest first
+        self._storage_status: Dict[str, Dict] = {}
         
-    def initialize(self) -> bool:
+    async def initialize(self) -> bool:
         """Initialize processor connections."""
         try:
             # Initialize entity extractor
@@ -31,12 +82,12 @@ class NewsletterProcessor:
                 self.entity_extractor = EntityExtractor(self.config)
             
             # Connect to Neo4j
-            if not self.neo4j_client.connect():
+            if not await self.neo4j_client.connect():
                 logger.error("Failed to connect to Neo4j")
                 return False
             
             # Setup graph schema
-            self.neo4j_client.setup_constraints_and_indexes()
+            await self.neo4j_client.setup_constraints_and_indexes()
             
             logger.info("Newsletter processor initialized")
             return True
@@ -45,15 +96,24 @@ class NewsletterProcessor:
             logger.error("Failed to initialize processor", error=str(e))
             return False
     
-    def shutdown(self):
+    async def shutdown(self):
         """Shutdown processor connections."""
         if self.neo4j_client:
-            self.neo4j_client.close()
+            await self.neo4j_client.close()
+        await close_async_openai_clients()
+        shutdown_html_pool()
         logger.info("Newsletter processor shutdown")
     
-    def process_newsletter(self, request: NewsletterProcessingRequest) -> NewsletterProcessingResponse:
-        """Process a newsletter through the complete pipeline."""
-        start_time = datetime.now()
+    async def process_newsletter(self, request: NewsletterProcessingRequest, 
+                                 defer_storage: bool = False) -> NewsletterProcessingResponse:
+        """
+        Process a newsletter through the complete pipeline.
+        
+        With defer_storage, the response is returned once entities are extracted
+        and the graph write is left for store_pending() (status "accepted").
+        """
+        # Monotonic clock: processing_time is immune to wall-clock adjustments
+        start_time = time.monotonic()
         newsletter_id = str(uuid.uuid4())
         
         # Create newsletter object
@@ -68,118 +128,223 @@ class NewsletterProcessor:
         # Initialize state
         state = ExtractionState(newsletter=newsletter)
         
+        # Every event for this newsletter carries the same identifying fields
+        log = logger.bind(newsletter_id=newsletter_id, 
+                          subject=newsletter.subject, 
+                          sender=newsletter.sender)
+        
         try:
-            logger.info("Starting newsletter processing", 
-                       newsletter_id=newsletter_id,
-                       subject=newsletter.subject)
+            log.info("Starting newsletter processing")
             
-            # Step 1: Clean HTML content
-            state.current_step = "cleaning_html"
-            state.cleaned_text = clean_html_content(newsletter.html_content)
-            if not state.cleaned_text:
-                state.errors.append("Failed to clean HTML content")
+            if not await self._extract(state, log):
                 return self._create_error_response(state, start_time)
             
-            # Extract sections for additional context
-            sections = extract_text_sections(newsletter.html_content)
-            
-            # Step 2: Extract entities with LLM
-            state.current_step = "extracting_entities"
-            if not self.entity_extractor:
-                state.errors.append("Entity extractor not initialized")
-                return self._create_error_response(state, start_time)
-            state.extracted_entities = self.entity_extractor.extract_entities(state.cleaned_text)
-            logger.info("Entities extracted", count=len(state.extracted_entities))
-            
-            # Step 3: Create newsletter node in graph
-            state.current_step = "creating_newsletter_node"
-            newsletter_node = self.neo4j_client.create_newsletter_node(newsletter)
-            if not newsletter_node:
-                state.errors.append("Failed to create newsletter node")
-            
-            # Step 4: Process entities and create/update nodes
-            state.current_step = "processing_entities"
-            entity_summary = {
-                'Organization': 0, 'Person': 0, 'Product': 0, 
-                'Event': 0, 'Location': 0, 'Topic': 0
-            }
-            new_entities = 0
-            updated_entities = 0
-            
-            for entity in state.extracted_entities:
-                try:
-                    # Create or update entity
-                    result = self.neo4j_client.create_or_update_entity(entity)
-                    if result:
-                        if result.get('operation') == 'created':
-                            new_entities += 1
-                        else:
-                            updated_entities += 1
-                        
-                        # Link to newsletter
-                        self.neo4j_client.link_entity_to_newsletter(
-                            entity.name, 
-                            entity.type, 
-                            newsletter.newsletter_id, 
-                            entity.context
-                        )
-                        
-                        # Update summary
-                        entity_summary[entity.type] = entity_summary.get(entity.type, 0) + 1
-                        
-                except Exception as e:
-                    error_msg = f"Error processing entity {entity.name}: {str(e)}"
-                    state.errors.append(error_msg)
-                    logger.error(error_msg)
+            if defer_storage:
+                self._pending_storage[newsletter_id] = state
+                self._set_storage_status(newsletter_id, "pending")
+                return self._create_accepted_response(state, start_time, log)
             
-            # Step 5: Generate summary
-            state.current_step = "generating_summary"
-            entity_mentions = []
-            for entity_type, count in entity_summary.items():
-                if count > 0:
-                    entity_mentions.append(f"{count} {entity_type.lower()}{'s' if count > 1 else ''}")
-            
-            processing_time = (datetime.now() - start_time).total_seconds()
-            
-            state.text_summary = (
-                f"Processed newsletter '{newsletter.subject}' from {newsletter.sender}. "
-                f"Extracted {len(state.extracted_entities)} entities "
-                f"({', '.join(entity_mentions) if entity_mentions else 'none'}). "
-                f"Created {new_entities} new entities, updated {updated_entities} existing entities. "
-                f"Processing completed in {processing_time:.2f} seconds."
-            )
-            
-            # Create response
-            response = NewsletterProcessingResponse(
-                status="success",
-                newsletter_id=newsletter_id,
-                processing_time=processing_time,
-                entities_extracted=len(state.extracted_entities),
-                entities_new=new_entities,
-                entities_updated=updated_entities,
-                entity_summary=entity_summary,
-                text_summary=state.text_summary,
-                errors=state.errors
-            )
-            
-            logger.info("Newsletter processing completed", 
-                       newsletter_id=newsletter_id,
-                       processing_time=processing_time,
-                       entities_extracted=len(state.extracted_entities))
-            
-            return response
+            results = await self._store(state)
+            return self._create_success_response(state, results, start_time, log)
             
         except Exception as e:
             error_msg = f"Pipeline error: {str(e)}"
             state.errors.append(error_msg)
-            logger.error("Newsletter processing failed", 
-                        newsletter_id=newsletter_id,
-                        error=error_msg)
+            log.error("Newsletter processing failed", error=error_msg)
             return self._create_error_response(state, start_time)
     
-    def _create_error_response(self, state: ExtractionState, start_time: datetime) -> NewsletterProcessingResponse:
+    async def store_pending(self, newsletter_id: str):
+        """Write a newsletter accepted with defer_storage to the graph."""
+        state = self._pending_storage.pop(newsletter_id, None)
+        if state is None:
+            logger.warning("No pending newsletter to store", newsletter_id=newsletter_id)
+            return
+        
+        try:
+            await self._store(state)
+        except Exception as e:
+            state.errors.append(f"Pipeline error: {str(e)}")
+        
+        if state.errors:
+            logger.error("Deferred graph storage failed", 
+                        newsletter_id=newsletter_id,
+                        errors=state.errors)
+            self._set_storage_status(newsletter_id, "failed", state.errors)
+        else:
+            logger.info("Deferred graph storage completed", newsletter_id=newsletter_id)
+            self._set_storage_status(newsletter_id, "stored")
+    
+    def get_storage_status(self, newsletter_id: str) -> Optional[Dict]:
+        """Get the graph storage status of a newsletter accepted with defer_storage."""
+        return self._storage_status.get(newsletter_id)
+    
+    def _set_storage_status(self, newsletter_id: str, status: str, errors: List[str] = None):
+        """Record a storage status, evicting the oldest once the table is full."""
+        self._storage_status.pop(newsletter_id, None)
+        if len(self._storage_status) >= STORAGE_STATUS_MAX_ENTRIES:
+            self._storage_status.pop(next(iter(self._storage_status)))
+        self._storage_status[newsletter_id] = {
+            'newsletter_id': newsletter_id,
+            'status': status,
+            'errors': errors or []
+        }
+    
+    async def _extract(self, state: ExtractionState, log=logger) -> bool:
+        """Clean the HTML and extract entities, returning False if a step failed."""
+        newsletter = state.newsletter
+        
+        # Step 1: Clean HTML content and extract sections for additional context.
+        # Both run in one worker process call, off the event loop and its GIL
+        state.current_step = "cleaning_html"
+        pool = get_html_pool()
+        try:
+            state.cleaned_text, sections = await process_html_in_executor(newsletter.html_content, pool)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM killed); retry once on a fresh pool
+            log.warning("HTML worker pool broken, restarting it")
+            _discard_html_pool(pool)
+            state.cleaned_text, sections = await process_html_in_executor(
+                newsletter.html_content, get_html_pool()
+            )
+        if not state.cleaned_text:
+            state.errors.append("Failed to clean HTML content")
+            return False
+        
+        # Step 2: Extract entities with LLM
+        state.current_step = "extracting_entities"
+        if not self.entity_extractor:
+            state.errors.append("Entity extractor not initialized")
+            return False
+        state.extracted_entities = await self.entity_extractor.extract_entities_async(state.cleaned_text)
+        state.resolved_entities = self._deduplicate_entities(state.extracted_entities)
+        log.info("Entities extracted", count=len(state.extracted_entities), 
+                 unique=len(state.resolved_entities))
+        return True
+    
+    async def _store(self, state: ExtractionState) -> List[Dict]:
+        """Store the newsletter, entities and their links in one transaction."""
+        # Step 3: Store newsletter, entities and their links in one transaction
+        state.current_step = "storing_graph"
+        results = await self.neo4j_client.ingest_newsletter(state.newsletter, state.resolved_entities)
+        if results is None:
+            state.errors.append("Failed to store newsletter and entities in graph")
+            results = []
+        return results
+    
+    def _create_success_response(self, state: ExtractionState, results: List[Dict], 
+                                 start_time: float, log=logger) -> NewsletterProcessingResponse:
+        """Create the response for a newsletter stored in the graph."""
+        newsletter = state.newsletter
+        
+        # Step 4: Tally created/updated entities
+        state.current_step = "processing_entities"
+        entity_summary = self._count_entity_types(result['type'] for result in results)
+        new_entities = sum(1 for result in results if result.get('operation') == 'created')
+        updated_entities = len(results) - new_entities
+        
+        # Step 5: Generate summary
+        state.current_step = "generating_summary"
+        processing_time = time.monotonic() - start_time
+        
+        state.text_summary = (
+            f"Processed newsletter '{newsletter.subject}' from {newsletter.sender}. "
+            f"Extracted {len(state.extracted_entities)} entities "
+            f"({self._describe_entity_counts(entity_summary)}). "
+            f"Created {new_entities} new entities, updated {updated_entities} existing entities. "
+            f"Processing completed in {processing_time:.2f} seconds."
+        )
+        
+        # Create response
+        response = NewsletterProcessingResponse(
+            status="success",
+            newsletter_id=newsletter.newsletter_id,
+            processing_time=processing_time,
+            entities_extracted=len(state.extracted_entities),
+            entities_unique=len(state.resolved_entities),
+            entities_new=new_entities,
+            entities_updated=updated_entities,
+            entity_summary=entity_summary,
+            text_summary=state.text_summary,
+            errors=state.errors
+        )
+        
+        log.info("Newsletter processing completed", 
+                 processing_time=processing_time,
+                 entities_extracted=len(state.extracted_entities))
+        
+        return response
+    
+    def _create_accepted_response(self, state: ExtractionState, 
+                                  start_time: float, log=logger) -> NewsletterProcessingResponse:
+        """Create the response for a newsletter whose graph write was deferred."""
+        newsletter = state.newsletter
+        entity_summary = self._count_entity_types(entity.type for entity in state.resolved_entities)
+        
+        processing_time = time.monotonic() - start_time
+        state.text_summary = (
+            f"Processed newsletter '{newsletter.subject}' from {newsletter.sender}. "
+            f"Extracted {len(state.extracted_entities)} entities "
+            f"({self._describe_entity_counts(entity_summary)}). "
+            f"Graph storage queued; check /newsletter/{newsletter.newsletter_id}/status."
+        )
+        
+        log.info("Newsletter extraction completed, storage deferred", 
+                 processing_time=processing_time,
+                 entities_extracted=len(state.extracted_entities))
+        
+        return NewsletterProcessingResponse(
+            status="accepted",
+            newsletter_id=newsletter.newsletter_id,
+            processing_time=processing_time,
+            entities_extracted=len(state.extracted_entities),
+            entities_unique=len(state.resolved_entities),
+            entities_new=0,
+            entities_updated=0,
+            entity_summary=entity_summary,
+            text_summary=state.text_summary,
+            errors=state.errors
+        )
+    
+    @staticmethod
+    def _deduplicate_entities(entities: List[Entity]) -> List[Entity]:
+        """Merge entities sharing a name and type, keeping first-seen order."""
+        merged: Dict[tuple, Entity] = {}
+        for entity in entities:
+            key = (entity.name, entity.type)
+            existing = merged.get(key)
+            if existing is None:
+                merged[key] = entity
+                continue
+            
+            contexts = dict.fromkeys(c for c in (existing.context, entity.context) if c)
+            merged[key] = Entity.model_construct(
+                name=entity.name,
+                type=entity.type,
+                aliases=list(dict.fromkeys([*existing.aliases, *entity.aliases])),
+                confidence=max(existing.confidence, entity.confidence),
+                context=' | '.join(contexts)[:MAX_MERGED_CONTEXT_LENGTH] or None,
+                properties={**entity.properties, **existing.properties}
+            )
+        return list(merged.values())
+    
+    @staticmethod
+    def _count_entity_types(entity_types) -> Dict[str, int]:
+        """Count entities per type, listing every known type (zero if absent) first."""
+        entity_summary = dict.fromkeys(ENTITY_TYPES, 0)
+        entity_summary.update(Counter(entity_types))
+        return entity_summary
+    
+    @staticmethod
+    def _describe_entity_counts(entity_summary: Dict[str, int]) -> str:
+        """Describe non-zero entity counts, e.g. '2 organizations, 1 person'."""
+        return ', '.join(
+            f"{count} {entity_type.lower()}{'s' if count > 1 else ''}"
+            for entity_type, count in entity_summary.items() if count
+        ) or 'none'
+    
+    def _create_error_response(self, state: ExtractionState, start_time: float) -> NewsletterProcessingResponse:
         """Create an error response."""
-        processing_time = (datetime.now() - start_time).total_seconds()
+        processing_time = time.monotonic() - start_time
         
         return NewsletterProcessingResponse(
             status="error",
@@ -193,6 +358,10 @@ class NewsletterProcessor:
             errors=state.errors
         )
     
-    def get_graph_stats(self) -> Dict[str, int]:
+    async def get_graph_stats(self) -> Dict[str, int]:
         """Get current graph statistics."""
-        return self.neo4j_client.get_graph_stats()
\ No newline at end of file
+        return await self.neo4j_client.get_graph_stats()
+    
+    async def get_connection_health(self) -> Dict:
+        """Check the graph database connection."""
+        return await self.neo4j_client.get_connection_health()
\ No newline at end of file
@@ -0,0 +1,55 @@
+"""Shared pytest setup and fixtures."""
+import pytest
+import pytest_asyncio
+
+# Configure the test environment once, before any test module imports
+# application code (pytest.ini puts the src package on the path). Fixtures
+# run only after collection, which is too late for settings read at import.
+_env = pytest.MonkeyPatch()
+_env.setenv("ENVIRONMENT", "test")
+_env.setenv("OPENAI_API_KEY", "sk-test-key")
+_env.setenv("API_KEY", "test-api-key")
+
+
+def pytest_unconfigure(config):
+    """Restore the caller's environment when the session ends."""
+    _env.undo()
+
+
+@pytest.fixture(scope="session")
+def config():
+    """Application configuration, loaded once per test session.
+
+    Shared across tests: copy it (or use a Mock/SimpleNamespace) before changing settings.
+    """
+    from src.config_wrapper import Config
+    
+    return Config()
+
+
+@pytest.fixture(scope="session")
+def client():
+    """A TestClient for the app, built once per test session.
+
+    The lifespan is not entered, so tests never start the background
+    processor warm-up against a real Neo4j instance.
+    """
+    from fastapi.testclient import TestClient
+    from src.main import app
+    
+    return TestClient(app)
+
+
+@pytest_asyncio.fixture
+async def aclient():
+    """An httpx AsyncClient calling the app in-process over ASGITransport.
+
+    For async tests of read-only endpoints: requests run on the test's own
+    event loop, without the TestClient's portal thread. The lifespan is
+    not entered either.
+    """
+    import httpx
+    from src.main import app
+    
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as ac:
+        yield ac
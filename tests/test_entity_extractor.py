@@ -1,76 +1,113 @@
 """Tests for entity extraction functionality."""
-import sys
-import os
+import asyncio
 import json
-from unittest.mock import Mock, patch, MagicMock
-
-# Add the project root to Python path
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.insert(0, project_root)
-
-# Set test environment
-os.environ["ENVIRONMENT"] = "test"
-os.environ["OPENAI_API_KEY"] = "sk-test-key"
+from types import SimpleNamespace
+from unittest.mock import Mock, patch, MagicMock, AsyncMock
 
 import pytest
-from src.processors.entity_extractor import EntityExtractor
+from src.processors import entity_extractor
+from src.processors.entity_extractor import (
+    EntityExtractor, close_async_openai_clients, get_openai_client, get_async_openai_client,
+    get_request_semaphore
+)
 from src.models.newsletter import Entity
-from src.config_wrapper import Config
+
+# Valid entity extraction response shared by the tests, with its serialized form
+_MOCK_ENTITIES = {
+    "entities": [
+        {
+            "name": "OpenAI",
+            "type": "Organization",
+            "aliases": ["Open AI"],
+            "confidence": 0.95,
+            "context": "OpenAI announced GPT-4 at their developer conference",
+            "properties": {"sector": "AI"}
+        },
+        {
+            "name": "GPT-4",
+            "type": "Product",
+            "aliases": ["GPT 4"],
+            "confidence": 0.98,
+            "context": "OpenAI announced GPT-4 at their developer conference",
+            "properties": {"category": "LLM"}
+        },
+        {
+            "name": "Sam Altman",
+            "type": "Person",
+            "aliases": ["Samuel Altman"],
+            "confidence": 0.92,
+            "context": "CEO Sam Altman presented the new capabilities",
+            "properties": {"role": "CEO"}
+        }
+    ]
+}
+_MOCK_JSON = json.dumps(_MOCK_ENTITIES, separators=(',', ':'))
+
+# Responses exercising the extractor's filtering: low confidence, missing
+# required fields, and more entities than the configured maximum
+_MIXED_CONFIDENCE_JSON = json.dumps({
+    "entities": [
+        {"name": "HighConf", "type": "Organization", "confidence": 0.95, "context": "test"},
+        {"name": "LowConf", "type": "Organization", "confidence": 0.5, "context": "test"}  # Below threshold
+    ]
+}, separators=(',', ':'))
+_INCOMPLETE_JSON = json.dumps({
+    "entities": [
+        {"name": "ValidEntity", "type": "Organization", "confidence": 0.95, "context": "test"},
+        {"type": "Organization", "confidence": 0.95, "context": "test"},  # Missing name
+        {"name": "NoType", "confidence": 0.95, "context": "test"}  # Missing type
+    ]
+}, separators=(',', ':'))
+_MANY_ENTITIES_JSON = json.dumps({
+    "entities": [
+        {"name": f"Entity{i}", "type": "Organization", "confidence": 0.9 - (i * 0.1), "context": "test"}
+        for i in range(5)
+    ]
+}, separators=(',', ':'))
+
+# Longer than the 3000 char MAX_EXTRACTION_CHARS of mock_config
+_LONG_CONTENT = "A" * 5000
 
 
 class TestEntityExtractor:
     """Test entity extraction functionality."""
     
-    @pytest.fixture
-    def mock_config(self):
-        """Create a mock configuration for testing."""
-        config = Mock(spec=Config)
-        config.OPENAI_API_KEY = "sk-test-key"
-        config.LLM_MODEL = "gpt-4-turbo"
-        config.LLM_TEMPERATURE = 0.1
-        config.LLM_MAX_TOKENS = 2000
-        config.ENTITY_CONFIDENCE_THRESHOLD = 0.7
-        config.MAX_ENTITIES_PER_NEWSLETTER = 100
-        return config
+    @pytest.fixture(autouse=True)
+    def clear_openai_clients(self):
+        """Drop shared OpenAI clients so each test sees its own mock."""
+        get_openai_client.cache_clear()
+        entity_extractor._loop_resources.clear()
+        yield
+        get_openai_client.cache_clear()
+        entity_extractor._loop_resources.clear()
+    
+    @pytest.fixture(autouse=True)
+    def openai_stub(self, monkeypatch):
+        """Replace the OpenAI client with a plain stub; returns (client, response)."""
+        response = SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=""))])
+        client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(
+            create=Mock(return_value=response)
+        )))
+        monkeypatch.setattr('src.processors.entity_extractor.OpenAI', lambda **kwargs: client)
+        return client, response
     
     @pytest.fixture
-    def mock_openai_response(self):
-        """Create a mock OpenAI response with valid entity data."""
-        return {
-            "entities": [
-                {
-                    "name": "OpenAI",
-                    "type": "Organization",
-                    "aliases": ["Open AI"],
-                    "confidence": 0.95,
-                    "context": "OpenAI announced GPT-4 at their developer conference",
-                    "properties": {"sector": "AI"}
-                },
-                {
-                    "name": "GPT-4",
-                    "type": "Product",
-                    "aliases": ["GPT 4"],
-                    "confidence": 0.98,
-                    "context": "OpenAI announced GPT-4 at their developer conference",
-                    "properties": {"category": "LLM"}
-                },
-                {
-                    "name": "Sam Altman",
-                    "type": "Person",
-                    "aliases": ["Samuel Altman"],
-                    "confidence": 0.92,
-                    "context": "CEO Sam Altman presented the new capabilities",
-                    "properties": {"role": "CEO"}
-                }
-            ]
-        }
+    def mock_config(self):
+        """Create a plain configuration object for testing."""
+        return SimpleNamespace(
+            OPENAI_API_KEY="sk-test-key",
+            LLM_MODEL="gpt-4-turbo",
+            LLM_TEMPERATURE=0.1,
+            LLM_MAX_TOKENS=2000,
+            OPENAI_MAX_CONCURRENCY=50,
+            ENTITY_CONFIDENCE_THRESHOLD=0.7,
+            MAX_ENTITIES_PER_NEWSLETTER=100,
+            MAX_EXTRACTION_CHARS=3000
+        )
     
     def test_entity_extractor_initialization_success(self, mock_config):
         """Test successful EntityExtractor initialization."""
         with patch('src.processors.entity_extractor.OpenAI') as mock_openai:
-            
-            mock_openai.return_value = MagicMock()
-            
             extractor = EntityExtractor(mock_config)
             
             assert extractor.config == mock_config
@@ -80,12 +117,20 @@ class TestEntityExtractor:
                 timeout=30.0
             )
     
-    def test_entity_extractor_initialization_no_api_key(self):
+    def test_openai_client_shared_across_extractors(self, mock_config):
+        """Test extractors with the same API key share one OpenAI client."""
+        with patch('src.processors.entity_extractor.OpenAI') as mock_openai:
+            first = EntityExtractor(mock_config)
+            second = EntityExtractor(mock_config)
+            
+            assert first.client is second.client
+            mock_openai.assert_called_once()
+    
+    def test_entity_extractor_initialization_no_api_key(self, mock_config):
         """Test EntityExtractor initialization without API key."""
-        config = Mock(spec=Config)
-        config.OPENAI_API_KEY = None
+        mock_config.OPENAI_API_KEY = None
         
-        extractor = EntityExtractor(config)
+        extractor = EntityExtractor(mock_config)
         
         assert extractor.client is None
     
@@ -95,17 +140,13 @@ class TestEntityExtractor:
             extractor = EntityExtractor(mock_config)
             assert extractor.client is None
     
-    @patch('src.processors.entity_extractor.OpenAI')
-    def test_extract_entities_success(self, mock_openai_class, mock_config, mock_openai_response):
+    def test_extract_entities_success(self, openai_stub, mock_config):
         """Test successful entity extraction."""
         # Setup mock OpenAI client
-        mock_client = MagicMock()
-        mock_openai_class.return_value = mock_client
+        _, response = openai_stub
         
         # Mock the completion response
-        mock_response = MagicMock()
-        mock_response.choices[0].message.content = json.dumps(mock_openai_response, separators=(',', ':'))
-        mock_client.chat.completions.create.return_value = mock_response
+        response.choices[0].message.content = _MOCK_JSON
         
         extractor = EntityExtractor(mock_config)
         
@@ -119,17 +160,13 @@ class TestEntityExtractor:
         assert entities[1].name == "GPT-4"
         assert entities[2].name == "Sam Altman"
     
-    @patch('src.processors.entity_extractor.OpenAI')
-    def test_extract_entities_with_code_blocks(self, mock_openai_class, mock_config, mock_openai_response):
+    def test_extract_entities_with_code_blocks(self, openai_stub, mock_config):
         """Test entity extraction with JSON wrapped in code blocks."""
-        mock_client = MagicMock()
-        mock_openai_class.return_value = mock_client
+        _, response = openai_stub
         
         # Mock response with code block markers
-        response_with_blocks = f"```json\n{json.dumps(mock_openai_response, separators=(',', ':'))}\n```"
-        mock_response = MagicMock()
-        mock_response.choices[0].message.content = response_with_blocks
-        mock_client.chat.completions.create.return_value = mock_response
+        response_with_blocks = f"```json\n{_MOCK_JSON}\n```"
+        response.choices[0].message.content = response_with_blocks
         
         extractor = EntityExtractor(mock_config)
         entities = extractor.extract_entities("Test content")
@@ -137,34 +174,25 @@ class TestEntityExtractor:
         assert len(entities) == 3
         assert entities[0].name == "OpenAI"
     
-    @patch('src.processors.entity_extractor.OpenAI')
-    def test_extract_entities_malformed_json(self, mock_openai_class, mock_config):
+    def test_extract_entities_malformed_json(self, openai_stub, mock_config):
         """Test entity extraction with malformed JSON response."""
-        mock_client = MagicMock()
-        mock_openai_class.return_value = mock_client
+        _, response = openai_stub
         
         # Mock malformed JSON response
-        mock_response = MagicMock()
-        mock_response.choices[0].message.content = "This is not valid JSON"
-        mock_client.chat.completions.create.return_value = mock_response
+        response.choices[0].message.content = "This is not valid JSON"
         
         extractor = EntityExtractor(mock_config)
         entities = extractor.extract_entities("Test content")
         
         assert entities == []
     
-    @patch('src.processors.entity_extractor.OpenAI')
-    def test_extract_entities_json_with_extra_text(self, mock_openai_class, mock_config, mock_openai_response):
+    def test_extract_entities_json_with_extra_text(self, openai_stub, mock_config):
         """Test entity extraction with JSON embedded in extra text."""
-        mock_client = MagicMock()
-        mock_openai_class.return_value = mock_client
+        _, response = openai_stub
         
         # Mock response with JSON buried in text
-        json_str = json.dumps(mock_openai_response, separators=(',', ':'))
-        response_with_text = f"Here are the entities I found: {json_str} That's all!"
-        mock_response = MagicMock()
-        mock_response.choices[0].message.content = response_with_text
-        mock_client.chat.completions.create.return_value = mock_response
+        response_with_text = f"Here are the entities I found: {_MOCK_JSON} That's all!"
+        response.choices[0].message.content = response_with_text
         
         extractor = EntityExtractor(mock_config)
         entities = extractor.extract_entities("Test content")
@@ -172,167 +200,276 @@ class TestEntityExtractor:
         assert len(entities) == 3
         assert entities[0].name == "OpenAI"
     
-    @patch('src.processors.entity_extractor.OpenAI')
-    def test_extract_entities_confidence_filtering(self, mock_openai_class, mock_config):
-        """Test entity extraction filters low confidence entities."""
-        mock_client = MagicMock()
-        mock_openai_class.return_value = mock_client
-        
-        # Create response with mix of high and low confidence entities
-        low_confidence_response = {
-            "entities": [
-                {
-                    "name": "HighConf",
-                    "type": "Organization",
-                    "confidence": 0.95,
-                    "context": "test"
-                },
-                {
-                    "name": "LowConf",
-                    "type": "Organization", 
-                    "confidence": 0.5,  # Below threshold
-                    "context": "test"
-                }
-            ]
-        }
-        
-        mock_response = MagicMock()
-        mock_response.choices[0].message.content = json.dumps(low_confidence_response, separators=(',', ':'))
-        mock_client.chat.completions.create.return_value = mock_response
+    @pytest.mark.parametrize("payload,max_entities,expected_names,limit_log", [
+        (_MIXED_CONFIDENCE_JSON, 100, ["HighConf"], None),
+        (_INCOMPLETE_JSON, 100, ["ValidEntity"], None),
+        # The log reports the count above the threshold before the cap was applied
+        (_MANY_ENTITIES_JSON, 2, ["Entity0", "Entity1"], {"total_extracted": 3, "limit": 2}),
+    ], ids=["confidence", "required_fields", "limit"])
+    def test_extract_entities_filtering(self, openai_stub, mock_config, payload, max_entities,
+                                        expected_names, limit_log):
+        """Test extraction drops low-confidence and incomplete entities and keeps the most confident up to the limit."""
+        _, response = openai_stub
+        response.choices[0].message.content = payload
+        mock_config.MAX_ENTITIES_PER_NEWSLETTER = max_entities
         
         extractor = EntityExtractor(mock_config)
-        entities = extractor.extract_entities("Test content")
+        with patch('src.processors.entity_extractor.logger') as mock_logger:
+            entities = extractor.extract_entities("Test content")
         
-        # Should only get high confidence entity
-        assert len(entities) == 1
-        assert entities[0].name == "HighConf"
+        assert [e.name for e in entities] == expected_names
+        if limit_log:
+            mock_logger.info.assert_any_call("Entities limited to maximum", **limit_log)
     
-    @patch('src.processors.entity_extractor.OpenAI')
-    def test_extract_entities_missing_required_fields(self, mock_openai_class, mock_config):
-        """Test entity extraction filters entities missing required fields."""
-        mock_client = MagicMock()
-        mock_openai_class.return_value = mock_client
-        
-        # Create response with entities missing required fields
-        incomplete_response = {
+    def test_extract_entities_invalid_field_types(self, openai_stub, mock_config):
+        """Test entity extraction skips or defaults malformed entity fields."""
+        _, response = openai_stub
+        
+        malformed_response = {
             "entities": [
+                {"name": "OutOfRange", "type": "Organization", "confidence": 1.5},
+                {"name": "NotANumber", "type": "Organization", "confidence": "high"},
+                {"name": ["List"], "type": "Organization", "confidence": 0.9},
                 {
-                    "name": "ValidEntity",
-                    "type": "Organization",
-                    "confidence": 0.95,
-                    "context": "test"
-                },
-                {
-                    # Missing name
-                    "type": "Organization",
-                    "confidence": 0.95,
-                    "context": "test"
-                },
-                {
-                    "name": "NoType",
-                    # Missing type
-                    "confidence": 0.95,
-                    "context": "test"
+                    "name": "Defaults",
+                    "type": "Topic",
+                    "confidence": 1,
+                    "aliases": None,
+                    "context": 42,
+                    "properties": ["not", "a", "dict"]
                 }
             ]
         }
         
-        mock_response = MagicMock()
-        mock_response.choices[0].message.content = json.dumps(incomplete_response, separators=(',', ':'))
-        mock_client.chat.completions.create.return_value = mock_response
+        response.choices[0].message.content = json.dumps(malformed_response)
         
         extractor = EntityExtractor(mock_config)
         entities = extractor.extract_entities("Test content")
         
-        # Should only get valid entity
         assert len(entities) == 1
-        assert entities[0].name == "ValidEntity"
+        entity = entities[0]
+        assert entity.name == "Defaults"
+        assert entity.confidence == 1.0
+        assert entity.aliases == []
+        assert entity.context is None
+        assert entity.properties == {}
+        assert entity.properties_json is None
     
-    @patch('src.processors.entity_extractor.OpenAI')
-    def test_extract_entities_limit_enforcement(self, mock_openai_class, mock_config):
-        """Test entity extraction enforces maximum entity limit."""
-        mock_config.MAX_ENTITIES_PER_NEWSLETTER = 2  # Set low limit
-        
-        mock_client = MagicMock()
-        mock_openai_class.return_value = mock_client
-        
-        # Create response with more entities than limit
-        many_entities_response = {
+    def test_extract_entities_non_string_aliases_dropped(self, openai_stub, mock_config):
+        """Test aliases that are not strings are dropped so the list stays List[str]."""
+        _, response = openai_stub
+        response.choices[0].message.content = json.dumps({
             "entities": [
-                {
-                    "name": f"Entity{i}",
-                    "type": "Organization",
-                    "confidence": 0.9 - (i * 0.1),  # Varying confidence
-                    "context": "test"
-                }
-                for i in range(5)
+                {"name": "OpenAI", "type": "Organization", "confidence": 0.9,
+                 "aliases": ["Open AI", 1, {"x": 2}, None, ["nested"], "OAI"]}
             ]
-        }
-        
-        mock_response = MagicMock()
-        mock_response.choices[0].message.content = json.dumps(many_entities_response, separators=(',', ':'))
-        mock_client.chat.completions.create.return_value = mock_response
+        })
         
         extractor = EntityExtractor(mock_config)
         entities = extractor.extract_entities("Test content")
         
-        # Should be limited to 2 entities with highest confidence
-        assert len(entities) == 2
-        assert entities[0].confidence >= entities[1].confidence
+        assert entities[0].aliases == ["Open AI", "OAI"]
     
-    def test_extract_entities_no_client(self, mock_config):
-        """Test entity extraction returns empty list when client not initialized."""
+    @pytest.mark.parametrize("drop_client,content", [
+        (True, "Test content"),  # Simulate failed initialization
+        (False, "")
+    ], ids=["no_client", "empty_content"])
+    def test_extract_entities_returns_empty(self, mock_config, drop_client, content):
+        """Test entity extraction returns an empty list without a client or content."""
         extractor = EntityExtractor(mock_config)
-        extractor.client = None  # Simulate failed initialization
+        if drop_client:
+            extractor.client = None
         
-        entities = extractor.extract_entities("Test content")
-        assert entities == []
+        assert extractor.extract_entities(content) == []
     
-    @patch('src.processors.entity_extractor.OpenAI')
-    def test_extract_entities_api_error(self, mock_openai_class, mock_config):
+    def test_extract_entities_api_error(self, openai_stub, mock_config):
         """Test entity extraction handles API errors gracefully."""
-        mock_client = MagicMock()
-        mock_openai_class.return_value = mock_client
-        mock_client.chat.completions.create.side_effect = Exception("API Error")
+        client, _ = openai_stub
+        client.chat.completions.create.side_effect = Exception("API Error")
         
         extractor = EntityExtractor(mock_config)
         entities = extractor.extract_entities("Test content")
         
         assert entities == []
     
-    @patch('src.processors.entity_extractor.OpenAI')
-    def test_extract_entities_empty_content(self, mock_openai_class, mock_config):
-        """Test entity extraction with empty content."""
-        mock_client = MagicMock()
-        mock_openai_class.return_value = mock_client
+    @pytest.mark.asyncio
+    @patch('src.processors.entity_extractor.get_async_openai_client')
+    async def test_extract_entities_async(self, mock_get_async_client, openai_stub, mock_config):
+        """Test async entity extraction awaits the shared async client."""
+        client, response = openai_stub
+        response.choices[0].message.content = _MOCK_JSON
+        mock_async_client = MagicMock()
+        mock_async_client.chat.completions.create = AsyncMock(return_value=response)
+        mock_get_async_client.return_value = mock_async_client
         
         extractor = EntityExtractor(mock_config)
-        entities = extractor.extract_entities("")
+        entities = await extractor.extract_entities_async("OpenAI announced GPT-4.")
         
-        assert entities == []
+        assert [e.name for e in entities] == ["OpenAI", "GPT-4", "Sam Altman"]
+        mock_get_async_client.assert_called_once_with(mock_config.OPENAI_API_KEY)
+        mock_async_client.chat.completions.create.assert_awaited_once()
+        client.chat.completions.create.assert_not_called()
+    
+    def test_async_client_per_event_loop(self):
+        """Test each event loop gets its own async client, closed at shutdown."""
+        async def client_pair():
+            return get_async_openai_client("sk-test"), get_async_openai_client("sk-test")
+        
+        async def close_client():
+            client = get_async_openai_client("sk-test")
+            await close_async_openai_clients()
+            return client
+        
+        first, again = asyncio.run(client_pair())
+        second, _ = asyncio.run(client_pair())
+        closed = asyncio.run(close_client())
+        
+        assert first is again
+        assert second is not first
+        assert closed.is_closed()
+    
+    @pytest.mark.asyncio
+    @patch('src.processors.entity_extractor.get_async_openai_client')
+    async def test_extract_entities_async_api_error(self, mock_get_async_client, mock_config):
+        """Test async entity extraction handles API errors gracefully."""
+        mock_get_async_client.return_value.chat.completions.create = AsyncMock(side_effect=Exception("API Error"))
+        
+        extractor = EntityExtractor(mock_config)
+        assert await extractor.extract_entities_async("Test content") == []
+    
+    def test_extract_entities_response_cached(self, openai_stub, mock_config):
+        """Test identical content is answered from the response cache."""
+        client, response = openai_stub
+        response.choices[0].message.content = _MOCK_JSON
+        
+        extractor = EntityExtractor(mock_config)
+        first = extractor.extract_entities("OpenAI announced GPT-4.")
+        second = extractor.extract_entities("OpenAI announced GPT-4.")
+        extractor.extract_entities("Different content")
+        
+        assert [e.name for e in first] == [e.name for e in second]
+        assert client.chat.completions.create.call_count == 2
+    
+    def test_extract_entities_unparseable_response_not_cached(self, openai_stub, mock_config):
+        """Test responses that fail to parse are requested again."""
+        client, response = openai_stub
+        response.choices[0].message.content = '{"entities": [invalid'
+        
+        extractor = EntityExtractor(mock_config)
+        assert extractor.extract_entities("Test content") == []
+        assert extractor.extract_entities("Test content") == []
+        assert client.chat.completions.create.call_count == 2
     
-    @patch('src.processors.entity_extractor.OpenAI')
-    def test_extract_entities_content_truncation(self, mock_openai_class, mock_config, mock_openai_response):
+    @pytest.mark.asyncio
+    async def test_extract_entities_batch(self, mock_config):
+        """Test batch extraction keeps input order and caps concurrent requests."""
+        in_flight, peak = 0, 0
+        
+        async def extract(content):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return [Entity(name=content, type="Topic", confidence=0.9)]
+        
+        extractor = EntityExtractor(mock_config)
+        extractor.extract_entities_async = AsyncMock(side_effect=extract)
+        
+        results = await extractor.extract_entities_batch(["a", "b", "c", "d", "e"], max_concurrency=2)
+        
+        assert [[e.name for e in entities] for entities in results] == [["a"], ["b"], ["c"], ["d"], ["e"]]
+        assert peak == 2
+    
+    @pytest.mark.asyncio
+    @patch('src.processors.entity_extractor.get_async_openai_client')
+    async def test_extract_entities_async_shares_request_limit(self, mock_get_async_client,
+                                                               mock_config):
+        """Test extractors sharing an API key share its in-flight request limit."""
+        mock_config.OPENAI_MAX_CONCURRENCY = 1
+        in_flight, peak = 0, 0
+        
+        async def create(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content='{"entities": []}'))])
+        
+        mock_async_client = MagicMock()
+        mock_async_client.chat.completions.create = AsyncMock(side_effect=create)
+        mock_get_async_client.return_value = mock_async_client
+        
+        extractors = [EntityExtractor(mock_config) for _ in range(2)]
+        await asyncio.gather(*(extractor.extract_entities_async(f"Content {i}")
+                               for i, extractor in enumerate(extractors)))
+        
+        assert mock_async_client.chat.completions.create.await_count == 2
+        assert peak == 1
+    
+    @patch('src.processors.entity_extractor.get_async_openai_client')
+    def test_request_limit_per_event_loop(self, mock_get_async_client, mock_config):
+        """Test the request limit still works when a later event loop contends for it."""
+        mock_config.OPENAI_MAX_CONCURRENCY = 1
+        mock_get_async_client.return_value.chat.completions.create = AsyncMock(
+            return_value=SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content='{"entities": []}'))])
+        )
+        
+        async def extract_concurrently(run):
+            extractor = EntityExtractor(mock_config)
+            await asyncio.gather(*(extractor.extract_entities_async(f"Run {run} content {i}")
+                                   for i in range(3)))
+            return get_request_semaphore(mock_config.OPENAI_API_KEY, 1)
+        
+        first = asyncio.run(extract_concurrently(1))
+        second = asyncio.run(extract_concurrently(2))
+        
+        assert second is not first
+        assert mock_get_async_client.return_value.chat.completions.create.await_count == 6
+    
+    def test_completion_request_prompt(self, mock_config):
+        """Test the prompt embeds the content verbatim and keeps the JSON schema intact."""
+        extractor = EntityExtractor(mock_config)
+        
+        content = 'Braces {content} and {{CONTENT}} stay as written'
+        prompt = extractor._completion_request(content)["messages"][1]["content"]
+        
+        assert content in prompt
+        assert '"entities": [' in prompt
+        assert '"properties": {\n        "additional_info"' in prompt
+        assert "{{" not in prompt.replace(content, "")
+    
+    def test_completion_request_json_mode(self, mock_config):
+        """Test JSON mode is requested only from models that support it."""
+        extractor = EntityExtractor(mock_config)
+        
+        assert extractor._completion_request("Test")["response_format"] == {"type": "json_object"}
+        mock_config.LLM_MODEL = "gpt-4"
+        assert "response_format" not in extractor._completion_request("Test")
+    
+    def test_extract_entities_content_truncation(self, openai_stub, mock_config):
         """Test entity extraction truncates long content."""
-        mock_client = MagicMock()
-        mock_openai_class.return_value = mock_client
+        client, response = openai_stub
         
-        mock_response = MagicMock()
-        mock_response.choices[0].message.content = json.dumps(mock_openai_response, separators=(',', ':'))
-        mock_client.chat.completions.create.return_value = mock_response
+        response.choices[0].message.content = _MOCK_JSON
         
         extractor = EntityExtractor(mock_config)
         
-        # Create very long content
-        long_content = "A" * 5000  # Longer than 3000 char limit
-        entities = extractor.extract_entities(long_content)
+        with patch('src.processors.entity_extractor.logger') as mock_logger:
+            entities = extractor.extract_entities(_LONG_CONTENT)
+        
+        # The log reports the length before truncation
+        mock_logger.info.assert_any_call("Content truncated for entity extraction",
+                                         original_length=5000, truncated_length=3000)
         
         # Should still work and extract entities
         assert len(entities) == 3
         
         # Verify that the API was called with truncated content
-        mock_client.chat.completions.create.assert_called_once()
-        call_args = mock_client.chat.completions.create.call_args
-        prompt_content = call_args[1]["messages"][1]["content"]
+        client.chat.completions.create.assert_called_once()
+        prompt_content = client.chat.completions.create.call_args.kwargs["messages"][1]["content"]
         # The content in the prompt should be truncated
-        assert len(prompt_content) < 5000
\ No newline at end of file
+        assert len(prompt_content) < 5000
+        assert "A" * 3000 + "..." in prompt_content
+        assert "A" * 3001 not in prompt_content
\ No newline at end of file
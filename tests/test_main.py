@@ -1,65 +1,42 @@
 import sys
 import os
+import subprocess
+from unittest.mock import patch
 
-# Add the project root to Python path
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.insert(0, project_root)
-
-# Set test environment
-os.environ["ENVIRONMENT"] = "test"
-os.environ["OPENAI_API_KEY"] = "sk-test-key"
+import pytest
 
 # Import via module path
 from src.main import app
-from fastapi.testclient import TestClient
 import src.main as main
 
-# Defer client creation to avoid initialization issues
-client = None
-
-def test_read_root():
-    global client
-    if not client:
-        client = TestClient(app)
-    response = client.get("/")
+@pytest.mark.asyncio
+async def test_read_root(aclient):
+    response = await aclient.get("/")
     assert response.status_code == 200
     data = response.json()
-    assert "message" in data
-    assert "description" in data
-    assert "endpoints" in data
-    assert "environment" in data
-    assert "version" in data
+    assert {"message", "description", "endpoints", "environment", "version"} <= data.keys()
     assert data["message"] == "Arrgh! Newsletter Processing API"
     assert "/newsletter/process" in data["endpoints"]
 
-def test_health_check():
-    global client
-    if not client:
-        client = TestClient(app)
-    response = client.get("/health")
+@pytest.mark.asyncio
+async def test_health_check(aclient):
+    response = await aclient.get("/health")
     assert response.status_code == 200
     data = response.json()
     assert data["status"] == "healthy"
-    assert "environment" in data
-    assert "version" in data
-    assert "service" in data
+    assert {"environment", "version", "service"} <= data.keys()
 
-def test_readiness_check():
-    global client
-    if not client:
-        client = TestClient(app)
-    response = client.get("/ready")
+@pytest.mark.asyncio
+async def test_readiness_check(aclient):
+    response = await aclient.get("/ready")
     assert response.status_code == 200
     data = response.json()
     assert data["status"] == "ready"
-    assert "environment" in data
-    assert "version" in data
+    assert {"environment", "version"} <= data.keys()
 
-def test_health_check_during_shutdown():
+@pytest.mark.serial
+def test_health_check_during_shutdown(client):
     """Test that health check returns unhealthy status during shutdown."""
-    global client
-    if not client:
-        client = TestClient(app)
     
     # First, verify normal healthy state
     response = client.get("/health")
@@ -67,9 +44,8 @@ def test_health_check_during_shutdown():
     assert response.json()["status"] == "healthy"
     
     # Simulate shutdown condition by setting the shutdown flag
-    original_shutdown_event = main.shutdown_event
     try:
-        main.shutdown_event = True
+        main.shutdown_event.set()
         
         # Now health check should return unhealthy
         response = client.get("/health")
@@ -80,4 +56,74 @@ def test_health_check_during_shutdown():
         
     finally:
         # Reset the shutdown flag to not affect other tests
-        main.shutdown_event = original_shutdown_event 
\ No newline at end of file
+        main.shutdown_event.clear()
+
+@pytest.mark.serial
+def test_readiness_checks_cached(client):
+    """Test registered readiness checks are polled once per cache window."""
+    calls = []
+    
+    async def neo4j_check():
+        calls.append(1)
+        return len(calls) > 1
+    
+    try:
+        main.register_ready_check(neo4j_check)
+        
+        response = client.get("/ready")
+        assert response.status_code == 503
+        assert response.json() == {"status": "not ready", "failed_checks": ["neo4j_check"]}
+        
+        # Within the TTL the cached result is served without re-running the check
+        assert client.get("/ready").status_code == 503
+        assert len(calls) == 1
+        
+        # Once expired, the check runs again
+        main._ready_cache["ts"] -= main.READY_CACHE_TTL_SECONDS
+        assert client.get("/ready").status_code == 200
+        assert len(calls) == 2
+    finally:
+        main._ready_checks.clear()
+        main._ready_cache["value"] = None
+
+def test_app_import_defers_heavy_dependencies():
+    """Test importing the production app does not load the LLM, graph or HTML parsing stacks."""
+    code = (
+        "import sys, src.main; "
+        "print(sorted(m for m in ('openai', 'neo4j', 'bs4', 'html2text') if m in sys.modules))"
+    )
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=project_root, capture_output=True, text=True, check=True,
+        env={**os.environ, "ENVIRONMENT": "production"}
+    )
+    assert result.stdout.strip() == "[]"
+
+def test_diagnostics_endpoints_mounted_outside_production():
+    """Test the diagnostics router is included in non-production environments."""
+    paths = {route.path for route in app.routes}
+    assert "/test-connectivity" in paths
+    assert "/test-openai" in paths
+
+def test_default_response_class_uses_orjson(client):
+    """Test endpoint dicts are serialized with orjson."""
+    assert app.router.default_response_class is main.ORJSONResponse
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+
+def test_connectivity_results_cached(client):
+    """Test connectivity probes are reused until they expire or a refresh is requested."""
+    from src.routers import diagnostics
+    probe_results = {"timestamp": 0.0, "tests": [{"success": True}, {"success": False}]}
+    
+    with patch.object(diagnostics, "run_connectivity_tests", return_value=probe_results) as mock_run, \
+         patch.dict(diagnostics._connectivity_cache, {"ts": 0.0, "value": None}):
+        first = client.get("/test-connectivity").json()
+        second = client.get("/test-connectivity").json()
+        refreshed = client.get("/test-connectivity", params={"refresh": "true"}).json()
+    
+    assert mock_run.call_count == 2
+    assert first["summary"] == {"total_tests": 2, "successful": 1, "failed": 1}
+    assert (first["cached"], second["cached"], refreshed["cached"]) == (False, True, False)
@@ -1,34 +1,35 @@
 """Tests for newsletter processing functionality."""
-import sys
-import os
-
-# Add the project root to Python path
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.insert(0, project_root)
-
-# Set test environment
-os.environ["ENVIRONMENT"] = "test"
-os.environ["OPENAI_API_KEY"] = "sk-test-key"
-os.environ["API_KEY"] = "test-api-key"
-
+import asyncio
 import pytest
-from unittest.mock import Mock, patch
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
 from datetime import datetime
 
-# FastAPI testing
-from src.main import app
-from fastapi.testclient import TestClient
-
 # Newsletter processing components
 from src.models.newsletter import (
     Newsletter, NewsletterProcessingRequest, Entity
 )
-from src.processors.html_processor import clean_html_content, extract_text_sections
+from src.processors.html_processor import (
+    clean_html_content, extract_text_sections, cache_info, clear_caches, process_html_in_executor
+)
 from src.config_wrapper import Config
+from src.workflows import newsletter_processor
 
 
-# Defer client creation to avoid initialization issues
-client = None
+class _BrokenOnceExecutor(ThreadPoolExecutor):
+    """Executor whose first submit fails like a process pool with a dead worker."""
+    
+    def __init__(self):
+        super().__init__(max_workers=1)
+        self.broken = True
+    
+    def submit(self, fn, /, *args, **kwargs):
+        if self.broken:
+            self.broken = False
+            raise BrokenProcessPool("A process in the process pool was terminated abruptly")
+        return super().submit(fn, *args, **kwargs)
 
 
 class TestNewsletterModels:
@@ -44,6 +45,7 @@ class TestNewsletterModels:
         assert newsletter.subject == "Test Newsletter"
         assert newsletter.sender == "test@example.com"
         assert len(newsletter.html_content) > 0
+        assert newsletter.content_length == len("<h1>Test</h1><p>Content</p>")
     
     def test_entity_model_creation(self):
         """Test Entity model creation."""
@@ -57,6 +59,14 @@ class TestNewsletterModels:
         assert entity.type == "Organization"
         assert entity.confidence == 0.95
         assert entity.aliases == []  # default empty list
+        assert entity.properties_json is None  # empty properties are stored as null
+    
+    def test_entity_properties_json(self):
+        """Test Entity properties are serialized for graph storage."""
+        entity = Entity(name="OpenAI", type="Organization", confidence=0.95,
+                        properties={"sector": "AI", "funding": {"rank": 1}})
+        assert entity.properties_json == '{"sector":"AI","funding":{"rank":1}}'
+        assert entity.model_dump()["properties"] == {"sector": "AI", "funding": {"rank": 1}}
 
 
 class TestHTMLProcessor:
@@ -117,33 +127,99 @@ class TestHTMLProcessor:
         assert len(sections["paragraphs"]) == 2
         assert len(sections["links"]) == 1
         assert sections["links"][0]["url"] == "http://example.com"
+    
+    def test_html_results_cached_by_content(self):
+        """Test repeated HTML is served from cache and cached sections cannot be mutated."""
+        clear_caches()
+        test_html = "<h1>Cached</h1><p>Body</p>"
+        
+        assert clean_html_content(test_html) == clean_html_content(test_html)
+        first = extract_text_sections(test_html)
+        first["headers"].append("mutated")
+        second = extract_text_sections(test_html)
+        
+        assert second["headers"] == ["Cached"]
+        info = cache_info()
+        assert info["clean_html_content"] == {"hits": 1, "misses": 1, "size": 1, "max_entries": 256}
+        assert info["extract_text_sections"]["hits"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_process_html_in_executor(self):
+        """Test fused cleaning and section extraction in a worker, with repeats served locally."""
+        from concurrent.futures import ProcessPoolExecutor
+        
+        clear_caches()
+        test_html = "<h1>Worker</h1><p>Body</p>"
+        
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            cleaned_text, sections = await process_html_in_executor(test_html, executor)
+        
+        assert cleaned_text == clean_html_content(test_html)
+        assert sections == extract_text_sections(test_html)
+        
+        # Served from this process's caches without an executor
+        assert await process_html_in_executor(test_html, executor=None) == (cleaned_text, sections)
+    
+    def test_extract_text_sections_uses_lxml(self):
+        """Test section extraction queries lxml directly, without building a BeautifulSoup tree."""
+        clear_caches()
+        
+        with patch("bs4.BeautifulSoup", side_effect=AssertionError("BeautifulSoup used")):
+            sections = extract_text_sections(
+                '<?xml version="1.0" encoding="utf-8"?>'
+                '<html><head><title>Title</title></head><body><h1>Header</h1>'
+                '<p>GPT-<b>5</b></p><p> </p><a href="https://example.com">Link</a><a>No URL</a></body></html>'
+            )
+        
+        assert sections == {
+            "title": "Title",
+            "headers": ["Header"],
+            "paragraphs": ["GPT-5"],
+            "links": [{"text": "Link", "url": "https://example.com"}]
+        }
+    
+    def test_extract_text_sections_empty_document(self):
+        """Test a document lxml cannot parse into a tree yields empty sections."""
+        clear_caches()
+        
+        assert extract_text_sections("<!-- nothing here -->") == {
+            "title": "", "headers": [], "paragraphs": [], "links": []
+        }
+    
+    def test_extract_text_sections_without_lxml(self):
+        """Test section extraction falls back to BeautifulSoup's html.parser when lxml is unavailable."""
+        import sys
+        
+        clear_caches()
+        
+        # A None entry makes the import raise ImportError
+        with patch.dict(sys.modules, {"lxml.html": None}):
+            sections = extract_text_sections("<h1>Header</h1><p>Paragraph</p>")
+        
+        assert sections["title"] == "Header"
+        assert sections["headers"] == ["Header"]
+        assert sections["paragraphs"] == ["Paragraph"]
 
 
 class TestNewsletterEndpoints:
     """Test newsletter API endpoints."""
     
-    def test_newsletter_health_endpoint(self):
+    @pytest.mark.asyncio
+    async def test_newsletter_health_endpoint(self, aclient):
         """Test newsletter health check endpoint."""
-        global client
-        if not client:
-            client = TestClient(app)
-        response = client.get("/newsletter/health")
+        response = await aclient.get("/newsletter/health")
         assert response.status_code == 200
         
         data = response.json()
-        assert "status" in data
-        assert "initialized" in data
-        assert "neo4j_connected" in data
+        assert {"status", "initialized", "neo4j_connected"} <= data.keys()
         
         # Status should be either healthy or unhealthy
         assert data["status"] in ["healthy", "unhealthy"]
     
-    def test_newsletter_stats_endpoint(self):
+    @pytest.mark.asyncio
+    async def test_newsletter_stats_endpoint(self, aclient):
         """Test newsletter stats endpoint."""
-        global client
-        if not client:
-            client = TestClient(app)
-        response = client.get("/newsletter/stats")
+        response = await aclient.get("/newsletter/stats")
         
         # Should succeed or fail gracefully
         if response.status_code == 200:
@@ -162,7 +238,7 @@ class TestNewsletterEndpoints:
             assert response.status_code in [500, 503]
     
     @patch('src.workflows.newsletter_processor.NewsletterProcessor')
-    def test_newsletter_process_endpoint_success(self, mock_processor_class):
+    def test_newsletter_process_endpoint_success(self, mock_processor_class, client):
         """Test successful newsletter processing."""
         # Mock the processor
         mock_processor = Mock()
@@ -181,7 +257,7 @@ class TestNewsletterEndpoints:
             "text_summary": "Successfully processed test newsletter",
             "errors": []
         }
-        mock_processor.process_newsletter.return_value = type('obj', (object,), mock_response)()
+        mock_processor.process_newsletter.return_value = SimpleNamespace(**mock_response)
         
         # Test data
         request_data = {
@@ -190,9 +266,6 @@ class TestNewsletterEndpoints:
             "sender": "news@ai.com"
         }
         
-        global client
-        if not client:
-            client = TestClient(app)
         response = client.post("/newsletter/process", json=request_data)
         
         if response.status_code == 200:
@@ -204,14 +277,58 @@ class TestNewsletterEndpoints:
         elif response.status_code in [422, 500, 503]:
             pass  # Expected when dependencies aren't available
     
-    def test_newsletter_process_endpoint_validation(self):
-        """Test newsletter processing endpoint validation."""
-        # Create a fresh client to ensure environment is set
-        test_client = TestClient(app)
+    @pytest.mark.asyncio
+    @patch('src.workflows.newsletter_processor.NewsletterProcessor')
+    async def test_processor_initialized_once_under_concurrency(self, mock_processor_class):
+        """Test concurrent first requests share a single processor initialization."""
+        from src.routers import newsletter as newsletter_router
+        
+        async def initialize():
+            await asyncio.sleep(0)
+            return True
+        
+        mock_processor_class.return_value.initialize = AsyncMock(side_effect=initialize)
+        
+        with patch.multiple(newsletter_router, initialized=False, processor=None, config=None,
+                            _init_lock=asyncio.Lock()):
+            processors = await asyncio.gather(*(newsletter_router.get_processor() for _ in range(5)))
         
+        assert mock_processor_class.call_count == 1
+        mock_processor_class.return_value.initialize.assert_awaited_once()
+        assert all(p is mock_processor_class.return_value for p in processors)
+    
+    @pytest.mark.asyncio
+    async def test_api_key_check(self):
+        """Test the API key dependency accepts only the configured key."""
+        from fastapi import HTTPException
+        from src import security
+        
+        with patch.object(security, "_API_KEY_BYTES", b"test-api-key"):
+            assert await security.get_api_key("test-api-key") == "test-api-key"
+            for wrong_key in ("test-api-kez", "test", "", None):
+                with pytest.raises(HTTPException) as exc_info:
+                    await security.get_api_key(wrong_key)
+                assert exc_info.value.status_code == 401
+        
+        with patch.object(security, "_API_KEY_BYTES", None):
+            with pytest.raises(HTTPException) as exc_info:
+                await security.get_api_key("test-api-key")
+            assert exc_info.value.status_code == 500
+    
+    def test_storage_status_requires_api_key(self, client):
+        """Test deferred storage statuses are not readable without an API key."""
+        from src import security
+        
+        with patch.object(security, "_API_KEY_BYTES", b"test-api-key"):
+            assert client.get("/newsletter/test-123/status").status_code == 401
+            response = client.get("/newsletter/test-123/status", headers={"X-API-Key": "wrong-key"})
+            assert response.status_code == 401
+    
+    def test_newsletter_process_endpoint_validation(self, client):
+        """Test newsletter processing endpoint validation."""
         # Test with missing required fields (but with API key header)
         headers = {"X-API-Key": "test-api-key"}
-        response = test_client.post("/newsletter/process", json={}, headers=headers)
+        response = client.post("/newsletter/process", json={}, headers=headers)
         # Should return validation error (422) or initialization error (500/503)
         assert response.status_code in [422, 500, 503]
         
@@ -221,18 +338,134 @@ class TestNewsletterEndpoints:
             "subject": "",       # Empty subject
             "sender": "invalid"  # Invalid email format would be caught by validation
         }
-        response = test_client.post("/newsletter/process", json=invalid_data, headers=headers)
+        response = client.post("/newsletter/process", json=invalid_data, headers=headers)
         # Should either validate or fail gracefully
         assert response.status_code in [200, 422, 500, 503]
 
 
+class TestNewsletterProcessor:
+    """Test the newsletter processing workflow."""
+    
+    @pytest.fixture(autouse=True)
+    def html_pool(self, monkeypatch):
+        """Parse HTML on one worker thread instead of starting the shared process pool."""
+        pool = ThreadPoolExecutor(max_workers=1)
+        monkeypatch.setattr(newsletter_processor, "get_html_pool", Mock(return_value=pool))
+        yield pool
+        pool.shutdown()
+        newsletter_processor.shutdown_html_pool()
+    
+    @pytest.fixture
+    def processor(self):
+        """Create a processor with mocked extraction and graph storage."""
+        from src.workflows.newsletter_processor import NewsletterProcessor
+        
+        neo4j_client = Mock()
+        processor = NewsletterProcessor(Mock(spec=Config), neo4j_client=neo4j_client)
+        processor.entity_extractor = Mock()
+        processor.entity_extractor.extract_entities_async = AsyncMock(return_value=[
+            Entity(name="OpenAI", type="Organization", confidence=0.9),
+            Entity(name="GPT-5", type="Product", confidence=0.9)
+        ])
+        neo4j_client.ingest_newsletter = AsyncMock(return_value=[
+            {'name': "OpenAI", 'type': "Organization", 'operation': "created"},
+            {'name': "GPT-5", 'type': "Product", 'operation': "updated"}
+        ])
+        return processor
+    
+    @pytest.fixture
+    def request_model(self):
+        """Create a processing request for the sample newsletter."""
+        return NewsletterProcessingRequest(
+            html_content=SAMPLE_NEWSLETTER_HTML, subject="AI Weekly", sender="news@ai.com"
+        )
+    
+    @pytest.mark.asyncio
+    async def test_process_newsletter_stores_graph(self, processor, request_model):
+        """Test processing extracts and stores entities before responding."""
+        response = await processor.process_newsletter(request_model)
+        
+        assert response.status == "success"
+        assert response.entities_new == 1
+        assert response.entities_updated == 1
+        assert response.entity_summary == {
+            'Organization': 1, 'Person': 0, 'Product': 1, 'Event': 0, 'Location': 0, 'Topic': 0
+        }
+        assert "(1 organization, 1 product)" in response.text_summary
+        processor.neo4j_client.ingest_newsletter.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    async def test_process_newsletter_recovers_from_broken_html_pool(self, processor, html_pool,
+                                                                     monkeypatch):
+        """Test a broken HTML worker pool is discarded and the parse retried on a fresh one."""
+        broken = _BrokenOnceExecutor()
+        monkeypatch.setattr(newsletter_processor, "_html_pool", broken)
+        newsletter_processor.get_html_pool.side_effect = [broken, html_pool]
+        
+        clear_caches()
+        request = NewsletterProcessingRequest(
+            html_content="<h1>Recovery</h1><p>OpenAI shipped GPT-5.</p>", subject="Recovery", sender="news@ai.com"
+        )
+        response = await processor.process_newsletter(request)
+        
+        assert response.status == "success"
+        assert newsletter_processor.get_html_pool.call_count == 2
+        assert newsletter_processor._html_pool is None
+    
+    @pytest.mark.asyncio
+    async def test_process_newsletter_deferred_storage(self, processor, request_model):
+        """Test deferred storage responds after extraction and stores on store_pending."""
+        response = await processor.process_newsletter(request_model, defer_storage=True)
+        
+        assert response.status == "accepted"
+        assert response.entities_extracted == 2
+        assert response.entity_summary["Organization"] == 1
+        processor.neo4j_client.ingest_newsletter.assert_not_awaited()
+        assert processor.get_storage_status(response.newsletter_id)["status"] == "pending"
+        
+        await processor.store_pending(response.newsletter_id)
+        
+        processor.neo4j_client.ingest_newsletter.assert_awaited_once()
+        assert processor.get_storage_status(response.newsletter_id)["status"] == "stored"
+    
+    @pytest.mark.asyncio
+    async def test_duplicate_entities_merged_before_storage(self, processor, request_model):
+        """Test entities repeated with the same name and type are stored once."""
+        processor.entity_extractor.extract_entities_async.return_value = [
+            Entity(name="OpenAI", type="Organization", confidence=0.8, context="launch", aliases=["OAI"]),
+            Entity(name="GPT-5", type="Product", confidence=0.9),
+            Entity(name="OpenAI", type="Organization", confidence=0.95, context="CEO", 
+                   aliases=["OAI", "Open AI"], properties={"hq": "SF"})
+        ]
+        
+        response = await processor.process_newsletter(request_model)
+        
+        stored = processor.neo4j_client.ingest_newsletter.await_args.args[1]
+        assert [e.name for e in stored] == ["OpenAI", "GPT-5"]
+        assert stored[0].context == "launch | CEO"
+        assert stored[0].aliases == ["OAI", "Open AI"]
+        assert stored[0].confidence == 0.95
+        assert stored[0].properties == {"hq": "SF"}
+        assert (response.entities_extracted, response.entities_unique) == (3, 2)
+    
+    @pytest.mark.asyncio
+    async def test_deferred_storage_failure_recorded(self, processor, request_model):
+        """Test a failed deferred graph write is reported through the status."""
+        processor.neo4j_client.ingest_newsletter.return_value = None
+        response = await processor.process_newsletter(request_model, defer_storage=True)
+        
+        await processor.store_pending(response.newsletter_id)
+        
+        status = processor.get_storage_status(response.newsletter_id)
+        assert status["status"] == "failed"
+        assert status["errors"] == ["Failed to store newsletter and entities in graph"]
+
+
 class TestConfiguration:
     """Test configuration loading."""
     
-    def test_config_loading(self):
+    def test_config_loading(self, config):
         """Test configuration can be loaded."""
-        config = Config()
-        
         # Should have default values
         assert config.LLM_MODEL is not None
         assert config.NEO4J_URI is not None
@@ -267,4 +500,4 @@ SAMPLE_NEWSLETTER_HTML = """
 
 if __name__ == "__main__":
     # Run tests with pytest
-    pytest.main([__file__, "-v"])
\ No newline at end of file
+    pytest.main([__file__, "-v", "-p", "no:cacheprovider"])
\ No newline at end of file